@@ -158,7 +158,7 @@ class TicketCompletionAdmin(admin.ModelAdmin):
         'submitted_at'
     ]
     
-    list_filter = ['ai_verified', 'submitted_at']
+    list_filter = ['verification_status', 'submitted_at']
     
     search_fields = [
         'ticket__ticket_number',
@@ -173,16 +173,21 @@ class TicketCompletionAdmin(admin.ModelAdmin):
         'contractor_longitude',
         'distance_from_original',
         'ai_verified',
+        'verification_status',
         'ai_verification_message',
         'submitted_at'
     ]
     
     def ai_verified_display(self, obj):
         """Display verification status with visual indicator."""
-        if obj.ai_verified:
+        if obj.verification_status == 'VERIFIED':
             return format_html(
                 '<span style="color: green; font-weight: bold;">✓ Verified</span>'
             )
+        elif obj.verification_status == 'PENDING':
+            return format_html(
+                '<span style="color: orange; font-weight: bold;">… Pending</span>'
+            )
         else:
             return format_html(
                 '<span style="color: red; font-weight: bold;">✗ Not Verified</span>'
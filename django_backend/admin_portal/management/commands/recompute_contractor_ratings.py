@@ -0,0 +1,37 @@
+"""
+Django Management Command: recompute_contractor_ratings
+
+This command recalculates every contractor's average rating from their
+rated tickets. New ratings are normally applied by a coalesced background
+flush whose pending set lives in process memory, so a worker exit can
+drop it; this full sweep repairs any rating missed that way. Designed to
+run as an hourly cron job.
+
+Usage:
+    python manage.py recompute_contractor_ratings
+
+Cron Schedule:
+    0 * * * * cd /path/to/project && python manage.py recompute_contractor_ratings
+"""
+
+from django.core.management.base import BaseCommand
+from admin_portal.tasks import recompute_contractor_ratings
+
+
+class Command(BaseCommand):
+    """
+    Management command to recalculate all contractor ratings.
+
+    Runs the same single UPDATE as the background flush, over every
+    contractor.
+    """
+
+    help = 'Recalculate every contractor average rating from rated tickets'
+
+    def handle(self, *args, **options):
+        """Execute the full rating sweep."""
+        updated = recompute_contractor_ratings()
+
+        self.stdout.write(
+            self.style.SUCCESS(f'✓ Recalculated ratings for {updated} contractor(s).')
+        )
@@ -0,0 +1,44 @@
+from django.db import migrations, models
+
+
+def backfill_verification_status(apps, schema_editor):
+    """
+    Derive the status of existing completions from their stored result.
+    
+    Completions with neither a positive result nor a message have no
+    recorded outcome and stay PENDING, so the retry command verifies them.
+    """
+    TicketCompletion = apps.get_model("admin_portal", "TicketCompletion")
+    
+    TicketCompletion.objects.filter(ai_verified=True).update(
+        verification_status="VERIFIED"
+    )
+    TicketCompletion.objects.filter(
+        ai_verified=False,
+        ai_verification_message__isnull=False
+    ).update(verification_status="NOT_VERIFIED")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("admin_portal", "0002_remove_contractor_assigned_area_contractor_user_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ticketcompletion",
+            name="verification_status",
+            field=models.CharField(
+                choices=[
+                    ("PENDING", "Pending"),
+                    ("VERIFIED", "Verified"),
+                    ("NOT_VERIFIED", "Not Verified"),
+                ],
+                db_index=True,
+                default="PENDING",
+                help_text="PENDING until the background AI check stores its result",
+                max_length=20,
+            ),
+        ),
+        migrations.RunPython(backfill_verification_status, migrations.RunPython.noop),
+    ]
@@ -12,6 +12,7 @@ from django.db import models
 from django.core.validators import RegexValidator
 from django.contrib.auth.models import User
 from django.utils import timezone
+from user_portal.utils.background import run_in_background
 
 
 class Ward(models.Model):
@@ -162,29 +163,6 @@ class Contractor(models.Model):
     
     def __str__(self):
         return f"{self.contractor_name} - {self.department} ({self.ratings:.2f}★)"
-    
-    def update_average_rating(self):
-        """
-        Recalculate average rating from all completed tickets.
-        
-        This method is called automatically when a user rates a ticket.
-        It aggregates all user_rating values from resolved tickets
-        assigned to this contractor.
-        """
-        from django.db.models import Avg
-        from user_portal.models import Ticket
-        
-        # Calculate average rating from all tickets with user ratings
-        avg_rating = Ticket.objects.filter(
-            contractor=self,
-            user_rating__isnull=False
-        ).aggregate(
-            avg=Avg('user_rating')
-        )['avg']
-        
-        # Update contractor's rating (convert to 0.00 if no ratings exist)
-        self.ratings = avg_rating if avg_rating is not None else 0.00
-        self.save(update_fields=['ratings', 'updated_at'])
 
 
 def contractor_completion_image_path(instance, filename):
@@ -229,8 +207,18 @@ class TicketCompletion(models.Model):
         3. System sends before/after images to AI verification API
         4. AI returns is_completed (True/False) and optional error message
         5. If completed=True, admin is notified and can mark ticket resolved
+    
+    Verification runs in the background, so verification_status stays
+    PENDING until a result is stored (see the
+    retry_pending_verifications command for completions left pending).
     """
     
+    VERIFICATION_STATUS_CHOICES = [
+        ('PENDING', 'Pending'),
+        ('VERIFIED', 'Verified'),
+        ('NOT_VERIFIED', 'Not Verified'),
+    ]
+    
     # Link to ticket being completed
     ticket = models.OneToOneField(
         'user_portal.Ticket',
@@ -286,6 +274,14 @@ class TicketCompletion(models.Model):
         help_text="AI response message (error details if verification failed)"
     )
     
+    verification_status = models.CharField(
+        max_length=20,
+        choices=VERIFICATION_STATUS_CHOICES,
+        default='PENDING',
+        db_index=True,
+        help_text="PENDING until the background AI check stores its result"
+    )
+    
     # Submission timestamp
     submitted_at = models.DateTimeField(
         auto_now_add=True,
@@ -299,18 +295,21 @@ class TicketCompletion(models.Model):
         verbose_name_plural = 'Ticket Completions'
     
     def __str__(self):
-        status = "✓ Verified" if self.ai_verified else "✗ Not Verified"
-        return f"{self.ticket.ticket_number} - {status}"
+        return f"{self.ticket.ticket_number} - {self.get_verification_status_display()}"
     
     def delete(self, *args, **kwargs):
         """
         Override delete to remove after-image file from storage.
+        
+        Uses the storage backend on a background worker, after commit.
         """
-        if self.after_image:
-            if os.path.isfile(self.after_image.path):
-                os.remove(self.after_image.path)
+        image_name = self.after_image.name if self.after_image else None
+        storage = self.after_image.storage
         
         super().delete(*args, **kwargs)
+        
+        if image_name:
+            run_in_background(storage.delete, image_name)
 
 
 class Notification(models.Model):
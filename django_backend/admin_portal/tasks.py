@@ -0,0 +1,125 @@
+"""
+Admin Portal Background Tasks.
+
+Work that runs outside the request/response cycle:
+- Recalculation of contractor average ratings
+"""
+
+import logging
+import threading
+from functools import partial
+from typing import Iterable, Optional
+
+from django.db import transaction
+from django.db.models import Avg, DecimalField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from admin_portal.models import Contractor
+from user_portal.utils.background import submit_background
+
+
+logger = logging.getLogger(__name__)
+
+
+# Contractors whose rating must be recalculated by the next flush
+_pending_contractor_ids = set()
+_pending_lock = threading.Lock()
+_flush_scheduled = False
+
+
+def schedule_rating_update(contractor_id: int) -> None:
+    """
+    Queue a contractor rating recalculation once the current transaction commits.
+
+    Nothing is recorded until the commit: if the transaction rolls back,
+    Django drops the callback and the pending state is left untouched.
+
+    Args:
+        contractor_id: Contractor primary key
+    """
+    transaction.on_commit(partial(_queue_rating_update, contractor_id))
+
+
+def _queue_rating_update(contractor_id: int) -> None:
+    """
+    Add a contractor to the pending set and start a flush if none is queued.
+
+    Ratings submitted in a burst are coalesced: while a flush is waiting
+    to run, further requests for any contractor only join the pending
+    set, so each contractor is recalculated once per flush.
+
+    Args:
+        contractor_id: Contractor primary key
+    """
+    global _flush_scheduled
+
+    with _pending_lock:
+        _pending_contractor_ids.add(contractor_id)
+        if _flush_scheduled:
+            return
+        _flush_scheduled = True
+
+    try:
+        submit_background(recompute_pending_ratings)
+    except Exception:
+        # Pool unavailable (e.g. interpreter shutdown); let the next
+        # rating schedule a flush instead of blocking all future ones
+        with _pending_lock:
+            _flush_scheduled = False
+        raise
+
+
+def recompute_pending_ratings() -> None:
+    """
+    Recalculate ratings for every pending contractor.
+
+    The pending set lives in process memory and is lost if the worker
+    exits before the flush runs; the recompute_contractor_ratings
+    management command repairs any rating missed that way.
+    """
+    global _flush_scheduled
+
+    with _pending_lock:
+        contractor_ids = list(_pending_contractor_ids)
+        _pending_contractor_ids.clear()
+        _flush_scheduled = False
+
+    recompute_contractor_ratings(contractor_ids)
+
+
+def recompute_contractor_ratings(contractor_ids: Optional[Iterable[int]] = None) -> int:
+    """
+    Recalculate contractor average ratings from their rated tickets.
+
+    All selected contractors are refreshed with a single UPDATE whose
+    value is a correlated AVG subquery over each contractor's rated
+    tickets, so nothing is loaded in Python.
+
+    Args:
+        contractor_ids: Contractor primary keys, or None for every contractor
+
+    Returns:
+        Number of contractors updated
+    """
+    from user_portal.models import Ticket
+
+    avg_rating = Ticket.objects.filter(
+        contractor_id=OuterRef('pk'),
+        user_rating__isnull=False
+    ).values('contractor_id').annotate(avg=Avg('user_rating')).values('avg')
+
+    contractors = Contractor.objects.all()
+    if contractor_ids is not None:
+        contractors = contractors.filter(pk__in=list(contractor_ids))
+
+    updated = contractors.update(
+        ratings=Coalesce(
+            Subquery(avg_rating, output_field=DecimalField()),
+            Value(0),
+            output_field=DecimalField()
+        ),
+        updated_at=timezone.now()
+    )
+
+    logger.info(f"Recalculated ratings for {updated} contractor(s)")
+    return updated
@@ -1,3 +1,63 @@
+import io
+from decimal import Decimal
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import transaction
 from django.test import TestCase
 
-# Create your tests here.
+from admin_portal import tasks
+from admin_portal.models import Contractor
+from user_portal.testing import create_contractor, create_ticket
+
+
+def run_now(func, *args, **kwargs):
+    """Run a background task inline, on the test's connection."""
+    func(*args, **kwargs)
+
+
+@mock.patch('admin_portal.tasks.submit_background', side_effect=run_now)
+class RatingFlushTests(TestCase):
+    """Contractor ratings are recalculated after rating commits."""
+
+    def setUp(self):
+        self.contractor = create_contractor()
+        self.ticket = create_ticket(status='RESOLVED', contractor=self.contractor)
+
+        self.addCleanup(tasks._pending_contractor_ids.clear)
+        self.addCleanup(setattr, tasks, '_flush_scheduled', False)
+
+    def test_rolled_back_rating_does_not_block_later_flushes(self, submit):
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                tasks.schedule_rating_update(self.contractor.id)
+                raise RuntimeError('rating transaction failed')
+
+        self.assertFalse(tasks._flush_scheduled)
+        self.assertFalse(tasks._pending_contractor_ids)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.ticket.user_rating = 4
+            self.ticket.save(update_fields=['user_rating', 'updated_at'])
+
+        self.contractor.refresh_from_db()
+        self.assertEqual(self.contractor.ratings, Decimal('4.00'))
+        self.assertFalse(tasks._flush_scheduled)
+
+
+class RecomputeContractorRatingsCommandTests(TestCase):
+    """The full sweep repairs ratings whose background flush was lost."""
+
+    def test_sweep_recalculates_every_contractor(self):
+        rated = create_contractor()
+        create_ticket(status='RESOLVED', contractor=rated, user_rating=5)
+        create_ticket(status='RESOLVED', contractor=rated, user_rating=2)
+        unrated = create_contractor(contractor_name='XYZ Builders')
+        Contractor.objects.filter(pk=unrated.pk).update(ratings=Decimal('3.00'))
+
+        call_command('recompute_contractor_ratings', stdout=io.StringIO())
+
+        rated.refresh_from_db()
+        unrated.refresh_from_db()
+        self.assertEqual(rated.ratings, Decimal('3.50'))
+        self.assertEqual(unrated.ratings, Decimal('0.00'))
@@ -108,6 +108,24 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Keep connections open between requests instead of reconnecting
+        # every time; health checks drop connections the server closed
+        'CONN_MAX_AGE': int(os.getenv("DB_CONN_MAX_AGE", "600")),
+        'CONN_HEALTH_CHECKS': True,
+    }
+}
+
+
+# Cache (geocoding results). Per-process memory by default; point
+# CACHE_BACKEND/CACHE_LOCATION at a shared backend (e.g.
+# django.core.cache.backends.redis.RedisCache, redis://host:6379/1) so
+# all workers share cached addresses.
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        'LOCATION': os.getenv("CACHE_LOCATION", "civic-complaints"),
     }
 }
 
@@ -153,6 +171,31 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Request body limit (non-file data). Photo capture posts a base64 image
+# of at most 5MB (~6.7MB encoded) inside JSON. DRF reads JSON bodies from
+# the stream without applying this limit, so CapturePhotoView checks
+# Content-Length against it before the body is read.
+DATA_UPLOAD_MAX_MEMORY_SIZE = 8 * 1024 * 1024
+
+# Background tasks (per-process thread pool for AI calls and file cleanup)
+BACKGROUND_TASK_WORKERS = int(os.getenv("BACKGROUND_TASK_WORKERS", "4"))
+
+# Reverse geocoding cache lifetime in seconds (addresses rarely change)
+GEOCODE_CACHE_TTL = int(os.getenv("GEOCODE_CACHE_TTL", str(60 * 60 * 24 * 30)))
+
+# Lifetime of "no address found" entries, kept short so misses are retried
+GEOCODE_MISS_TTL = int(os.getenv("GEOCODE_MISS_TTL", str(60 * 60)))
+
+# Nominatim request rate per process (public usage policy: max 1/second)
+NOMINATIM_QPS = float(os.getenv("NOMINATIM_QPS", "1"))
+
+# Nominatim request timeout in seconds (free tier is often slower than 10s)
+NOMINATIM_TIMEOUT = int(os.getenv("NOMINATIM_TIMEOUT", "15"))
+
+# Ticket tracking payload cache lifetime in seconds (saves invalidate it;
+# the TTL bounds staleness after bulk .update() calls that bypass save())
+TRACK_TICKET_CACHE_TTL = int(os.getenv("TRACK_TICKET_CACHE_TTL", "15"))
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
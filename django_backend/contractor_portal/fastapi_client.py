@@ -9,12 +9,17 @@ Implements retry logic, timeout handling, and error management.
 """
 
 import os
-import base64
+import pybase64
+from contextlib import nullcontext
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, Optional, Tuple
+from typing import BinaryIO, Dict, Any, Iterator, Optional, Tuple, Union
 from decimal import Decimal
 from dotenv import load_dotenv
+from user_portal.utils.image_validator import downscale_for_analysis
 
 # Load environment variables from .env file in project root
 env_path = Path(__file__).resolve().parent.parent.parent / ".env"
@@ -26,26 +31,57 @@ class FastAPIError(Exception):
     pass
 
 
+def _create_session() -> requests.Session:
+    """
+    Create the HTTP session shared by all FastAPIClient instances.
+    
+    Keep-alive connections to the AI service are pooled per process,
+    so requests (from any thread) skip the TCP/TLS handshake.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+_session = _create_session()
+
+
 class FastAPIClient:
     """
     Client for communicating with FastAPI AI services.
     
     Handles image encoding, API requests, retries, and error handling
     for both analyze and verify endpoints.
+    
+    The base URL and endpoint URLs are resolved once at import time
+    (environment is loaded above) instead of on every instantiation.
     """
     
+    # Base URL from environment, without trailing slash
+    base_url = os.getenv('FASTAPI_BASE_URL', 'http://localhost:8000').rstrip('/')
+    
+    # Endpoint URLs
+    analyze_url = f"{base_url}/api/v1/analyze/complaint"
+    verify_url = f"{base_url}/api/v1/verify/completion"
+    predict_url = f"{base_url}/api/v1/analytics/predict"
+    
+    # Configure timeouts (in seconds)
+    timeout = 60  # AI processing can take time
+    max_retries = 3
+    
+    # Raw bytes read per chunk when streaming an image into a request body.
+    # Must be a multiple of 3 so the encoded chunks join into valid base64.
+    stream_chunk_size = 48 * 1024  # 64 KB of base64 per chunk
+    
+    # Longest side of complaint images sent for analysis (model input size)
+    analysis_max_side = 1280
+    
     def __init__(self):
-        """Initialize FastAPI client with base URL from environment."""
-        self.base_url = os.getenv('FASTAPI_BASE_URL', 'http://localhost:8000')
+        """Initialize FastAPI client, ensuring a base URL is configured."""
         if not self.base_url:
             raise FastAPIError("FASTAPI_BASE_URL environment variable not set")
-        
-        # Remove trailing slash
-        self.base_url = self.base_url.rstrip('/')
-        
-        # Configure timeouts (in seconds)
-        self.timeout = 60  # AI processing can take time
-        self.max_retries = 3
     
     @staticmethod
     def encode_image_to_base64(image_path: str) -> str:
@@ -63,13 +99,74 @@ class FastAPIClient:
         """
         try:
             with open(image_path, 'rb') as image_file:
-                encoded = base64.b64encode(image_file.read()).decode('utf-8')
+                encoded = pybase64.b64encode(image_file.read()).decode('utf-8')
                 return encoded
         except FileNotFoundError:
             raise FastAPIError(f"Image file not found: {image_path}")
         except Exception as e:
             raise FastAPIError(f"Failed to encode image: {str(e)}")
     
+    @classmethod
+    def stream_json_with_image(
+        cls,
+        image: Union[str, BinaryIO],
+        image_key: str,
+        fields: Dict[str, Any]
+    ) -> Iterator[bytes]:
+        """
+        Yield a JSON request body with an image embedded as base64.
+        
+        The image file is read and encoded chunk by chunk, so the full
+        file and its base64 form are never held in memory at once.
+        requests sends a generator body with chunked transfer encoding.
+        
+        Args:
+            image: Absolute path to image file, or an open binary file
+                   (read from the start and left open for retries)
+            image_key: JSON key for the base64 image string
+            fields: Remaining JSON-serializable payload fields
+        
+        Yields:
+            Consecutive byte chunks of the JSON document
+        """
+        # Unbuffered reads straight into one reusable chunk buffer, so file
+        # data is not copied through Python's read buffer or a new bytes
+        # object per chunk
+        buffer = bytearray(cls.stream_chunk_size)
+        view = memoryview(buffer)
+        
+        if isinstance(image, str):
+            source = open(image, 'rb', buffering=0)
+        else:
+            image.seek(0)
+            source = nullcontext(image)
+        
+        with source as image_file:
+            yield b'{"' + image_key.encode('utf-8') + b'":"'
+            
+            while True:
+                # Fill the whole buffer (raw reads may return short) so
+                # every chunk but the last stays a multiple of 3 bytes
+                size = 0
+                while size < len(buffer):
+                    read = image_file.readinto(view[size:])
+                    if not read:
+                        break
+                    size += read
+                
+                if size:
+                    yield pybase64.b64encode(view[:size])
+                if size < len(buffer):
+                    break
+            
+            yield b'"'
+        
+        if fields:
+            # Strip the braces from the serialized object and append its members
+            yield b',' + orjson.dumps(fields)[1:-1]
+        
+        yield b'}'
+    
     @staticmethod
     def encode_image_field_to_base64(image_field) -> str:
         """
@@ -86,7 +183,7 @@ class FastAPIClient:
         """
         try:
             image_field.seek(0)  # Reset file pointer
-            encoded = base64.b64encode(image_field.read()).decode('utf-8')
+            encoded = pybase64.b64encode(image_field.read()).decode('utf-8')
             return encoded
         except Exception as e:
             raise FastAPIError(f"Failed to encode image field: {str(e)}")
@@ -131,12 +228,16 @@ class FastAPIClient:
         Raises:
             FastAPIError: If API call fails after retries
         """
-        # Encode image
-        image_base64 = self.encode_image_to_base64(image_path)
+        # Image is streamed from disk into the body on each attempt
+        if not os.path.isfile(image_path):
+            raise FastAPIError(f"Image file not found: {image_path}")
         
-        # Prepare request payload
-        payload = {
-            "image": image_base64,
+        # Send a model-sized copy of large camera photos; the original
+        # on disk is kept for the tracking page and audit
+        image = downscale_for_analysis(image_path, self.analysis_max_side) or image_path
+        
+        # Prepare request payload (everything except the image)
+        fields = {
             "street": street,
             "area": area,
             "postal_code": postal_code,
@@ -145,13 +246,13 @@ class FastAPIClient:
         }
         
         # Call API with retry logic
-        endpoint = f"{self.base_url}/api/v1/analyze/complaint"
+        endpoint = self.analyze_url
         
         for attempt in range(1, self.max_retries + 1):
             try:
-                response = requests.post(
+                response = _session.post(
                     endpoint,
-                    json=payload,
+                    data=self.stream_json_with_image(image, 'image', fields),
                     timeout=self.timeout,
                     headers={'Content-Type': 'application/json'}
                 )
@@ -211,9 +312,13 @@ class FastAPIClient:
         Raises:
             FastAPIError: If API call fails after retries
         """
-        # Encode both images
-        before_base64 = self.encode_image_to_base64(before_image_path)
-        after_base64 = self.encode_image_to_base64(after_image_path)
+        # Encode both images in parallel (file reads and base64 encoding
+        # release the GIL, so the two overlap)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            before_future = executor.submit(self.encode_image_to_base64, before_image_path)
+            after_future = executor.submit(self.encode_image_to_base64, after_image_path)
+            before_base64 = before_future.result()
+            after_base64 = after_future.result()
         
         # Prepare request payload
         payload = {
@@ -222,14 +327,17 @@ class FastAPIClient:
             "category": category
         }
         
+        # Serialize once with orjson instead of requests' stdlib json= path
+        body = orjson.dumps(payload)
+        
         # Call API with retry logic
-        endpoint = f"{self.base_url}/api/v1/verify/completion"
+        endpoint = self.verify_url
         
         for attempt in range(1, self.max_retries + 1):
             try:
-                response = requests.post(
+                response = _session.post(
                     endpoint,
-                    json=payload,
+                    data=body,
                     timeout=self.timeout,
                     headers={'Content-Type': 'application/json'}
                 )
@@ -293,14 +401,17 @@ class FastAPIClient:
         # Prepare request payload
         payload = {"tickets": tickets_data}
         
+        # Serialize once with orjson instead of requests' stdlib json= path
+        body = orjson.dumps(payload)
+        
         # Call API with retry logic
-        endpoint = f"{self.base_url}/api/v1/analytics/predict"
+        endpoint = self.predict_url
         
         for attempt in range(1, self.max_retries + 1):
             try:
-                response = requests.post(
+                response = _session.post(
                     endpoint,
-                    json=payload,
+                    data=body,
                     timeout=self.timeout,
                     headers={'Content-Type': 'application/json'}
                 )
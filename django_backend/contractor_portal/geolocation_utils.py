@@ -10,6 +10,10 @@ from decimal import Decimal
 from typing import Tuple
 
 
+# Earth's radius in meters
+EARTH_RADIUS_M = 6371000.0
+
+
 def haversine_distance(
     lat1: float,
     lon1: float,
@@ -37,22 +41,19 @@ def haversine_distance(
         >>> print(f"{distance:.2f} meters")
         85.23 meters
     """
-    # Earth's radius in meters
-    R = 6371000
-    
-    # Convert decimal degrees to radians
-    lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
+    # Convert decimal degrees to radians (no intermediate list/map object)
+    phi1 = radians(lat1)
+    phi2 = radians(lat2)
+    half_dlat = (phi2 - phi1) * 0.5
+    half_dlon = radians(lon2 - lon1) * 0.5
     
     # Haversine formula
-    dlat = lat2 - lat1
-    dlon = lon2 - lon1
-    a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
-    c = 2 * asin(sqrt(a))
+    sin_dlat = sin(half_dlat)
+    sin_dlon = sin(half_dlon)
+    a = sin_dlat * sin_dlat + cos(phi1) * cos(phi2) * sin_dlon * sin_dlon
     
     # Distance in meters
-    distance = R * c
-    
-    return distance
+    return 2.0 * EARTH_RADIUS_M * asin(sqrt(a))
 
 
 def is_within_radius(
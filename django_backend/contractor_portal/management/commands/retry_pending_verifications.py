@@ -0,0 +1,88 @@
+"""
+Django Management Command: retry_pending_verifications
+
+This command re-runs AI verification for work completions that are still
+PENDING. Verification normally runs on the in-process background pool,
+so a worker restart, deploy or crash can drop it; this sweep picks those
+completions up again. Designed to run as a cron job every 15 minutes.
+
+Usage:
+    python manage.py retry_pending_verifications
+    python manage.py retry_pending_verifications --older-than 30
+
+Cron Schedule:
+    */15 * * * * cd /path/to/project && python manage.py retry_pending_verifications
+"""
+
+import logging
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from admin_portal.models import TicketCompletion
+from contractor_portal.tasks import verify_completion
+
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+    Management command to retry stuck completion verifications.
+
+    Verifies, one after another, every TicketCompletion where:
+    - verification_status = PENDING
+    - submitted_at is older than --older-than minutes
+
+    The age threshold leaves completions whose background verification
+    may still be running alone.
+    """
+
+    help = 'Re-run AI verification for completions stuck in PENDING'
+
+    def add_arguments(self, parser):
+        """
+        Add command-line arguments.
+
+        --older-than: Minimum age in minutes of completions to retry
+        """
+        parser.add_argument(
+            '--older-than',
+            type=int,
+            default=15,
+            help='Only retry completions submitted at least this many minutes ago (default: 15)',
+        )
+
+    def handle(self, *args, **options):
+        """
+        Execute the retry command.
+
+        Args:
+            options: Command options (older_than minutes)
+        """
+        cutoff = timezone.now() - timedelta(minutes=options['older_than'])
+
+        completion_ids = list(
+            TicketCompletion.objects.filter(
+                verification_status='PENDING',
+                submitted_at__lte=cutoff
+            ).order_by('submitted_at').values_list('id', flat=True)
+        )
+
+        if not completion_ids:
+            self.stdout.write(
+                self.style.SUCCESS('No pending completions to verify.')
+            )
+            return
+
+        self.stdout.write(
+            self.style.WARNING(f'Retrying verification for {len(completion_ids)} completion(s)')
+        )
+
+        for completion_id in completion_ids:
+            verify_completion(completion_id)
+
+        self.stdout.write(
+            self.style.SUCCESS(f'✓ Processed {len(completion_ids)} pending completion(s).')
+        )
+
+        logger.info(f'Verification retry completed for {len(completion_ids)} completion(s)')
@@ -0,0 +1,84 @@
+"""
+Contractor Portal Background Tasks.
+
+Work that runs outside the request/response cycle:
+- AI verification of submitted work completions
+"""
+
+import logging
+
+from contractor_portal.fastapi_client import FastAPIClient, FastAPIError
+from admin_portal.models import TicketCompletion, Notification
+
+
+logger = logging.getLogger(__name__)
+
+
+def verify_completion(completion_id: int) -> None:
+    """
+    Run AI before/after verification for a work completion.
+
+    Process:
+    1. Load completion with its ticket and original complaint
+    2. Call FastAPI to compare before/after images
+    3. Store AI result on the completion and the ticket
+    4. Create notification for admin if AI verified
+
+    If the AI service fails the completion is kept, marked unverified,
+    and the error is stored so the admin can review it manually.
+
+    Only PENDING completions are verified, so a retry of a completion
+    that already has a result does nothing.
+
+    Args:
+        completion_id: TicketCompletion primary key
+    """
+    try:
+        completion = TicketCompletion.objects.select_related(
+            'ticket__civic_complaint', 'contractor'
+        ).get(id=completion_id, verification_status='PENDING')
+    except TicketCompletion.DoesNotExist:
+        logger.warning(f"Completion {completion_id} is no longer pending, skipping verification")
+        return
+
+    ticket = completion.ticket
+
+    try:
+        client = FastAPIClient()
+        result = client.verify_completion(
+            before_image_path=ticket.civic_complaint.image.path,
+            after_image_path=completion.after_image.path,
+            category=ticket.category
+        )
+        completion.ai_verified = result.get('is_completed', False)
+        completion.ai_verification_message = result.get('error')
+
+    except FastAPIError as e:
+        # AI verification failed - keep completion but mark as unverified
+        logger.error(f"FastAPI error verifying completion {completion_id}: {str(e)}")
+        completion.ai_verified = False
+        completion.ai_verification_message = str(e)
+
+    completion.verification_status = 'VERIFIED' if completion.ai_verified else 'NOT_VERIFIED'
+    completion.save(update_fields=['ai_verified', 'ai_verification_message', 'verification_status'])
+
+    # Update ticket ai_verified status
+    ticket.ai_verified = completion.ai_verified
+    ticket.save(update_fields=['ai_verified'])
+
+    # Create notification for admin if AI verified
+    if completion.ai_verified:
+        Notification.objects.create(
+            ticket=ticket,
+            notification_type='AI_VERIFICATION',
+            message=(
+                f'Work completion for ticket {ticket.ticket_number} has been '
+                f'verified by AI. Contractor: {completion.contractor.contractor_name}. '
+                f'You can now mark this ticket as resolved.'
+            )
+        )
+
+    logger.info(
+        f"Completion {completion_id} for ticket {ticket.ticket_number} "
+        f"verified={completion.ai_verified}"
+    )
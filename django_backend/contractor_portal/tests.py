@@ -1,3 +1,134 @@
-from django.test import TestCase
+import base64
+import io
+import json
+import os
+import tempfile
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from admin_portal.models import Notification, TicketCompletion
+from contractor_portal.fastapi_client import FastAPIClient, FastAPIError
+from contractor_portal.tasks import verify_completion
+from user_portal.testing import create_completion, create_contractor, create_ticket
+
+
+class VerifyCompletionTaskTests(TestCase):
+    """Background AI verification of submitted work completions."""
+
+    def setUp(self):
+        self.ticket = create_ticket(status='IN_PROGRESS', contractor=create_contractor())
+        self.completion = create_completion(self.ticket)
+
+    @mock.patch('contractor_portal.tasks.FastAPIClient')
+    def test_verified_completion_notifies_admin(self, client_class):
+        client_class.return_value.verify_completion.return_value = {
+            'is_completed': True,
+            'error': None
+        }
+
+        verify_completion(self.completion.id)
+
+        self.completion.refresh_from_db()
+        self.ticket.refresh_from_db()
+        self.assertEqual(self.completion.verification_status, 'VERIFIED')
+        self.assertTrue(self.completion.ai_verified)
+        self.assertTrue(self.ticket.ai_verified)
+        self.assertEqual(
+            Notification.objects.filter(ticket=self.ticket, notification_type='AI_VERIFICATION').count(),
+            1
+        )
+
+    @mock.patch('contractor_portal.tasks.FastAPIClient')
+    def test_ai_failure_keeps_completion_unverified(self, client_class):
+        client_class.return_value.verify_completion.side_effect = FastAPIError('service down')
+
+        verify_completion(self.completion.id)
+
+        self.completion.refresh_from_db()
+        self.ticket.refresh_from_db()
+        self.assertEqual(self.completion.verification_status, 'NOT_VERIFIED')
+        self.assertEqual(self.completion.ai_verification_message, 'service down')
+        self.assertFalse(self.ticket.ai_verified)
+        self.assertFalse(Notification.objects.filter(ticket=self.ticket).exists())
+
+    @mock.patch('contractor_portal.tasks.FastAPIClient')
+    def test_completion_with_result_is_not_verified_again(self, client_class):
+        TicketCompletion.objects.filter(pk=self.completion.pk).update(verification_status='NOT_VERIFIED')
+
+        verify_completion(self.completion.id)
+
+        client_class.assert_not_called()
+
+    def test_missing_completion_is_skipped(self):
+        verify_completion(self.completion.id + 1)
+
+        self.assertFalse(Notification.objects.exists())
+
+
+@mock.patch('contractor_portal.tasks.FastAPIClient')
+class RetryPendingVerificationsCommandTests(TestCase):
+    """Completions left PENDING are verified again by the sweep."""
+
+    def test_retries_only_stale_pending_completions(self, client_class):
+        client_class.return_value.verify_completion.return_value = {
+            'is_completed': True,
+            'error': None
+        }
+        contractor = create_contractor()
+        stale = create_completion(create_ticket(status='IN_PROGRESS', contractor=contractor))
+        recent = create_completion(create_ticket(status='IN_PROGRESS', contractor=contractor))
+        TicketCompletion.objects.filter(pk=stale.pk).update(
+            submitted_at=timezone.now() - timedelta(hours=1)
+        )
+
+        call_command('retry_pending_verifications', stdout=io.StringIO())
+
+        stale.refresh_from_db()
+        recent.refresh_from_db()
+        self.assertEqual(stale.verification_status, 'VERIFIED')
+        self.assertEqual(recent.verification_status, 'PENDING')
+
+
+class ShortReadFile(io.BytesIO):
+    """In-memory file whose readinto() returns at most a few bytes, like a raw pipe."""
+
+    def readinto(self, buffer):
+        return super().readinto(memoryview(buffer)[:7])
+
+
+@mock.patch.object(FastAPIClient, 'stream_chunk_size', 48)
+class StreamJsonWithImageTests(SimpleTestCase):
+    """Streamed request bodies join into the same JSON as a one-shot dump."""
+
+    # Several chunks plus a final chunk that is not a multiple of 3 bytes
+    IMAGE_BYTES = bytes(range(256)) * 2 + b'tail!!'
+
+    def _body(self, image):
+        fields = {'latitude': 23.0225, 'area': 'Satellite'}
+        body = b''.join(FastAPIClient.stream_json_with_image(image, 'image', fields))
+        return json.loads(body)
+
+    def test_streams_image_file_from_path(self):
+        fd, path = tempfile.mkstemp(suffix='.jpg')
+        self.addCleanup(os.remove, path)
+        with os.fdopen(fd, 'wb') as image_file:
+            image_file.write(self.IMAGE_BYTES)
+
+        payload = self._body(path)
+
+        self.assertEqual(payload, {
+            'image': base64.b64encode(self.IMAGE_BYTES).decode('ascii'),
+            'latitude': 23.0225,
+            'area': 'Satellite',
+        })
+
+    def test_short_reads_still_encode_whole_chunks(self):
+        # Without filling the buffer each 7-byte read would be encoded
+        # with its own padding and the joined base64 would be invalid
+        payload = self._body(ShortReadFile(self.IMAGE_BYTES))
+
+        self.assertEqual(payload['image'], base64.b64encode(self.IMAGE_BYTES).decode('ascii'))
@@ -23,8 +23,9 @@ from datetime import datetime, timedelta
 
 from contractor_portal.decorators import contractor_required
 from contractor_portal.geolocation_utils import is_within_radius, format_distance
-from contractor_portal.fastapi_client import FastAPIClient, FastAPIError
+from contractor_portal.tasks import verify_completion
 from user_portal.models import Ticket
+from user_portal.utils.background import run_in_background
 from admin_portal.models import Contractor, TicketCompletion, Notification
 
 
@@ -107,10 +108,20 @@ def dashboard(request):
     """
     contractor = request.user.contractor_profile
     
-    # Get all tickets assigned to this contractor
+    # Get all tickets assigned to this contractor, loading only the
+    # columns the dashboard list renders
     tickets = Ticket.objects.filter(contractor=contractor).select_related(
-        'civic_complaint', 'ward', 'contractor'
-    ).prefetch_related('completion')
+        'civic_complaint'
+    ).only(
+        'id',
+        'ticket_number',
+        'status',
+        'severity',
+        'category',
+        'ai_verified',
+        'created_at',
+        'civic_complaint__area',
+    )
     
     # Apply filters from GET parameters
     status_filter = request.GET.get('status', '')
@@ -119,16 +130,20 @@ def dashboard(request):
     date_to = request.GET.get('date_to', '')
     search_query = request.GET.get('search', '')
     
+    # Build all conditions first and apply them with a single filter()
+    # so the queryset is cloned once instead of once per filter
+    conditions = Q()
+    
     if status_filter and status_filter != 'all':
-        tickets = tickets.filter(status=status_filter.upper())
+        conditions &= Q(status=status_filter.upper())
     
     if severity_filter:
-        tickets = tickets.filter(severity=severity_filter)
+        conditions &= Q(severity=severity_filter)
     
     if date_from:
         try:
             date_from_obj = datetime.strptime(date_from, '%Y-%m-%d')
-            tickets = tickets.filter(created_at__gte=date_from_obj)
+            conditions &= Q(created_at__gte=date_from_obj)
         except ValueError:
             pass
     
@@ -137,17 +152,20 @@ def dashboard(request):
             date_to_obj = datetime.strptime(date_to, '%Y-%m-%d')
             # Include the entire end date
             date_to_obj = date_to_obj + timedelta(days=1)
-            tickets = tickets.filter(created_at__lt=date_to_obj)
+            conditions &= Q(created_at__lt=date_to_obj)
         except ValueError:
             pass
     
     if search_query:
-        tickets = tickets.filter(
+        conditions &= (
             Q(ticket_number__icontains=search_query) |
             Q(category__icontains=search_query) |
             Q(civic_complaint__area__icontains=search_query)
         )
     
+    if conditions:
+        tickets = tickets.filter(conditions)
+    
     # Calculate statistics
     total_tickets = tickets.count()
     assigned_count = tickets.filter(status='ASSIGNED').count()
@@ -201,17 +219,7 @@ def ticket_detail(request, ticket_id):
     )
     
     # Check if completion already exists
-    completion = None
-    try:
-        completion = TicketCompletion.objects.get(ticket=ticket)
-    except TicketCompletion.DoesNotExist:
-        pass
-    
-    # Generate Google Maps link
-    google_maps_url = (
-        f"https://www.google.com/maps/search/?api=1"
-        f"&query={ticket.civic_complaint.latitude},{ticket.civic_complaint.longitude}"
-    )
+    completion = TicketCompletion.objects.filter(ticket=ticket).first()
     
     # Parse comma-separated tools and equipment for display
     suggested_tools_list = []
@@ -225,7 +233,6 @@ def ticket_detail(request, ticket_id):
     context = {
         'ticket': ticket,
         'completion': completion,
-        'google_maps_url': google_maps_url,
         'contractor': contractor,
         'suggested_tools_list': suggested_tools_list,
         'safety_equipment_list': safety_equipment_list,
@@ -290,11 +297,9 @@ def submit_completion(request, ticket_id):
     1. Validate contractor is assigned to ticket
     2. Get contractor's current GPS location from request
     3. Verify location is within 50m of original complaint
-    4. Save after-photo
-    5. Call FastAPI to verify completion (before/after comparison)
-    6. Create TicketCompletion record
-    7. Create notification for admin if AI verified
-    8. Update ticket ai_verified status
+    4. Save after-photo and create TicketCompletion record
+    5. Queue AI verification (see contractor_portal.tasks.verify_completion)
+    6. Respond 202 Accepted with status 'pending_verification'
     
     Request must include:
     - after_image: Photo file
@@ -310,8 +315,8 @@ def submit_completion(request, ticket_id):
         contractor=contractor
     )
     
-    # Check if already completed
-    if hasattr(ticket, 'completion'):
+    # Check if already completed (cheap EXISTS instead of fetching the row)
+    if TicketCompletion.objects.filter(ticket_id=ticket.id).exists():
         return JsonResponse({
             'success': False,
             'error': 'Work completion already submitted for this ticket'
@@ -362,75 +367,19 @@ def submit_completion(request, ticket_id):
         distance_from_original=Decimal(str(distance))
     )
     
-    # Call FastAPI for AI verification
-    try:
-        client = FastAPIClient()
-        
-        # Get paths to images
-        before_image_path = ticket.civic_complaint.image.path
-        after_image_path = completion.after_image.path
-        
-        # Verify completion
-        result = client.verify_completion(
-            before_image_path=before_image_path,
-            after_image_path=after_image_path,
-            category=ticket.category
+    # AI verification (before/after comparison) can take up to a minute,
+    # so it runs in the background. The completion stays PENDING until a
+    # result is stored; retry_pending_verifications picks up any whose
+    # background run was lost to a worker restart.
+    run_in_background(verify_completion, completion.id)
+    
+    return JsonResponse({
+        'success': True,
+        'ai_verified': False,
+        'verification_status': completion.verification_status,
+        'status': 'pending_verification',
+        'message': (
+            'Work completion submitted successfully! AI verification is in progress. '
+            'The admin will review and mark the ticket as resolved.'
         )
-        
-        # Update completion with AI result
-        completion.ai_verified = result.get('is_completed', False)
-        completion.ai_verification_message = result.get('error')
-        completion.save()
-        
-        # Update ticket ai_verified status
-        ticket.ai_verified = completion.ai_verified
-        ticket.save(update_fields=['ai_verified'])
-        
-        # Create notification for admin if AI verified
-        if completion.ai_verified:
-            Notification.objects.create(
-                ticket=ticket,
-                notification_type='AI_VERIFICATION',
-                message=(
-                    f'Work completion for ticket {ticket.ticket_number} has been '
-                    f'verified by AI. Contractor: {contractor.contractor_name}. '
-                    f'You can now mark this ticket as resolved.'
-                )
-            )
-        
-        return JsonResponse({
-            'success': True,
-            'ai_verified': completion.ai_verified,
-            'message': (
-                'Work completion submitted successfully! AI has verified your work. '
-                'The admin will review and mark the ticket as resolved.'
-                if completion.ai_verified else
-                'Work completion submitted. AI verification did not pass. '
-                f'Reason: {completion.ai_verification_message or "Unknown"}'
-            )
-        })
-    
-    except FastAPIError as e:
-        # AI verification failed - still save completion but mark as unverified
-        completion.ai_verified = False
-        completion.ai_verification_message = str(e)
-        completion.save()
-        
-        return JsonResponse({
-            'success': True,
-            'ai_verified': False,
-            'message': (
-                f'Work completion submitted, but AI verification encountered an error: {str(e)}. '
-                f'Admin will manually review your submission.'
-            )
-        })
-    
-    except Exception as e:
-        # Unexpected error - delete completion and return error
-        completion.delete()
-        
-        return JsonResponse({
-            'success': False,
-            'error': f'Failed to process completion: {str(e)}'
-        }, status=500)
-
+    }, status=202)
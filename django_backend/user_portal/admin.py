@@ -5,10 +5,22 @@ Registers CivicComplaint, Ticket, and TicketNote models with customized admin in
 """
 
 from django.contrib import admin
-from django.utils.html import format_html
+from django.core.exceptions import ValidationError
+from django.utils.html import escape, format_html
+from django.utils.safestring import mark_safe
 from user_portal.models import CivicComplaint, Ticket, TicketNote
 
 
+# Thumbnail markup for the complaint list (URL is the only variable part)
+_PREVIEW_TPL = '<img src="{}" style="width: 50px; height: 50px; object-fit: cover;" />'
+
+# Star markup for each possible user rating (1-5), built once
+_RATING_HTML = {
+    rating: mark_safe(f'<span style="color: gold;">{"⭐" * rating}</span>')
+    for rating in range(1, 6)
+}
+
+
 @admin.register(CivicComplaint)
 class CivicComplaintAdmin(admin.ModelAdmin):
     """
@@ -34,6 +46,9 @@ class CivicComplaintAdmin(admin.ModelAdmin):
     
     list_filter = ['is_submit', 'is_valid', 'created_at']
     
+    # Bound thumbnail rendering work per page
+    list_per_page = 50
+    
     search_fields = ['area', 'street', 'postal_code', 'session_id']
     
     readonly_fields = ['session_id', 'created_at', 'updated_at', 'image_preview_large']
@@ -53,13 +68,25 @@ class CivicComplaintAdmin(admin.ModelAdmin):
         }),
     )
     
+    def get_queryset(self, request):
+        """
+        Load only the columns list_display needs on the changelist.
+        
+        The change form edits every field, so it keeps the full row.
+        """
+        queryset = super().get_queryset(request)
+        match = request.resolver_match
+        if match and match.url_name == 'user_portal_civiccomplaint_changelist':
+            queryset = queryset.only(
+                'id', 'session_id', 'area', 'postal_code',
+                'is_submit', 'is_valid', 'created_at', 'image'
+            )
+        return queryset
+    
     def image_preview(self, obj):
         """Display small image thumbnail in list view."""
         if obj.image:
-            return format_html(
-                '<img src="{}" style="width: 50px; height: 50px; object-fit: cover;" />',
-                obj.image.url
-            )
+            return mark_safe(_PREVIEW_TPL.format(escape(obj.image.url)))
         return 'No image'
     image_preview.short_description = 'Preview'
     
@@ -101,6 +128,9 @@ class TicketAdmin(admin.ModelAdmin):
     
     list_filter = ['status', 'department', 'severity', 'created_at']
     
+    # Join FK columns shown in list_display to avoid a query per row
+    list_select_related = ('contractor', 'ward')
+    
     search_fields = ['ticket_number', 'category', 'department']
     
     readonly_fields = ['ticket_number', 'created_at', 'updated_at', 'user_rating']
@@ -125,12 +155,29 @@ class TicketAdmin(admin.ModelAdmin):
     
     def user_rating_display(self, obj):
         """Display rating with stars."""
-        if obj.user_rating:
-            stars = '⭐' * obj.user_rating
-            return format_html('<span style="color: gold;">{}</span>', stars)
-        return '-'
+        return _RATING_HTML.get(obj.user_rating, '-')
     user_rating_display.short_description = 'User Rating'
     
+    def get_object(self, request, object_id, from_field=None):
+        """
+        Load the ticket for the change form with its relations joined.
+        
+        Same lookup as ModelAdmin.get_object, but contractor, ward and
+        civic complaint come back in the same query.
+        """
+        queryset = self.get_queryset(request).select_related(
+            'contractor', 'ward', 'civic_complaint'
+        )
+        field = (
+            Ticket._meta.pk if from_field is None
+            else Ticket._meta.get_field(from_field)
+        )
+        try:
+            object_id = field.to_python(object_id)
+            return queryset.get(**{field.name: object_id})
+        except (Ticket.DoesNotExist, ValidationError, ValueError):
+            return None
+    
     def save_model(self, request, obj, form, change):
         """
         Override save to handle status transitions.
@@ -161,6 +208,9 @@ class TicketNoteAdmin(admin.ModelAdmin):
     
     list_filter = ['note_type', 'created_at']
     
+    # Ticket (also used by TicketNote.__str__) and creator are shown per row
+    list_select_related = ('ticket', 'created_by')
+    
     search_fields = ['ticket__ticket_number', 'content', 'created_by__username']
     
     readonly_fields = ['created_at']
@@ -13,15 +13,25 @@ Cron Schedule:
 """
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from django.core.files.storage import default_storage
 from django.core.management.base import BaseCommand
+from django.db import transaction
 from django.utils import timezone
-from datetime import datetime, time
+from datetime import datetime, time, timedelta
 from user_portal.models import CivicComplaint
 
 
 logger = logging.getLogger(__name__)
 
 
+# Rows fetched per database round-trip when scanning today's drafts
+SNAPSHOT_CHUNK_SIZE = 2000
+
+# Ids per DELETE statement (stays under SQLite's bound parameter limit)
+DELETE_BATCH_SIZE = 500
+
+
 class Command(BaseCommand):
     """
     Management command to clean up unsubmitted civic complaints.
@@ -56,23 +66,35 @@ class Command(BaseCommand):
         """
         is_dry_run = options['dry_run']
         
-        # Get current date in Asia/Kolkata timezone
-        now = timezone.now()
+        # Start of the current day in Asia/Kolkata timezone
         today_start = timezone.make_aware(
-            datetime.combine(now.date(), time.min)
-        )
-        today_end = timezone.make_aware(
-            datetime.combine(now.date(), time.max)
+            datetime.combine(timezone.localdate(), time.min)
         )
         
-        # Query unsubmitted complaints from today
+        # Query unsubmitted complaints from today (half-open range keeps
+        # created_at bare so the partial index can serve it)
         unsubmitted_complaints = CivicComplaint.objects.filter(
             is_submit=False,
             created_at__gte=today_start,
-            created_at__lte=today_end
+            created_at__lt=today_start + timedelta(days=1)
         )
         
-        count = unsubmitted_complaints.count()
+        # Snapshot the few columns needed for the preview, the delete and
+        # file cleanup in one query (no separate COUNT(*) pass).
+        # Rows are streamed in chunks; only the first 10 are kept whole.
+        preview = []
+        image_names = {}
+        
+        snapshot = unsubmitted_complaints.values_list(
+            'id', 'image', 'area', 'created_at'
+        ).iterator(chunk_size=SNAPSHOT_CHUNK_SIZE)
+        
+        for complaint_id, image, area, created_at in snapshot:
+            image_names[complaint_id] = image
+            if len(preview) < 10:
+                preview.append((complaint_id, area, created_at))
+        
+        count = len(image_names)
         
         if count == 0:
             self.stdout.write(
@@ -86,10 +108,10 @@ class Command(BaseCommand):
             self.style.WARNING(f'Found {count} unsubmitted complaints from today:')
         )
         
-        for complaint in unsubmitted_complaints[:10]:  # Show first 10
+        for complaint_id, area, created_at in preview:  # Show first 10
             self.stdout.write(
-                f'  - ID: {complaint.id}, Area: {complaint.area}, '
-                f'Created: {complaint.created_at.strftime("%H:%M:%S")}'
+                f'  - ID: {complaint_id}, Area: {area}, '
+                f'Created: {timezone.localtime(created_at).strftime("%H:%M:%S")}'
             )
         
         if count > 10:
@@ -109,8 +131,14 @@ class Command(BaseCommand):
                 self.stdout.write(self.style.ERROR('Cleanup cancelled.'))
                 return
         
-        # Delete complaints
-        deleted_count, _ = unsubmitted_complaints.delete()
+        deleted_ids = self._delete_drafts(list(image_names))
+        deleted_count = len(deleted_ids)
+        
+        # Remove image files only for rows that were actually deleted
+        self._delete_image_files(
+            image_names[complaint_id] for complaint_id in deleted_ids
+            if image_names[complaint_id]
+        )
         
         self.stdout.write(
             self.style.SUCCESS(
@@ -120,7 +148,7 @@ class Command(BaseCommand):
         
         logger.info(
             f'Cleanup completed: Deleted {deleted_count} unsubmitted complaints '
-            f'from {now.date()}'
+            f'from {today_start.date()}'
         )
         
         # Log storage savings estimate
@@ -130,3 +158,56 @@ class Command(BaseCommand):
                 f'(assuming avg 2MB per photo)'
             )
         )
+    
+    def _delete_drafts(self, complaint_ids):
+        """
+        Delete the snapshotted drafts that are still unsubmitted.
+        
+        Uses plain DELETE ... WHERE statements: no per-row model loading,
+        signals or cascade collection (drafts never have tickets). Only the
+        snapshotted ids are targeted, and each is re-checked for
+        is_submit=False, so drafts created or submitted while the command
+        waited for confirmation are left alone. The ids still present
+        afterwards are re-selected in the same transaction to learn
+        exactly which rows were removed.
+        
+        Args:
+            complaint_ids: Ids captured in the snapshot
+        
+        Returns:
+            Set of ids whose rows were deleted
+        """
+        deleted_ids = set()
+        
+        with transaction.atomic():
+            for start in range(0, len(complaint_ids), DELETE_BATCH_SIZE):
+                batch = complaint_ids[start:start + DELETE_BATCH_SIZE]
+                
+                drafts = CivicComplaint.objects.filter(id__in=batch, is_submit=False)
+                drafts._raw_delete(drafts.db)
+                
+                remaining = set(
+                    CivicComplaint.objects.filter(id__in=batch).values_list('id', flat=True)
+                )
+                deleted_ids.update(set(batch) - remaining)
+        
+        return deleted_ids
+    
+    def _delete_image_files(self, image_names):
+        """
+        Delete image files from storage in parallel.
+        
+        File deletion is I/O bound (local disk or remote storage),
+        so a small thread pool overlaps the calls.
+        
+        Args:
+            image_names: Storage names of images to delete
+        """
+        def delete_file(name):
+            try:
+                default_storage.delete(name)
+            except Exception as e:
+                logger.error(f'Cleanup: Failed to delete image {name}: {str(e)}')
+        
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(delete_file, image_names))
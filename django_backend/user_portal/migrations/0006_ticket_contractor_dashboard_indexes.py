@@ -0,0 +1,51 @@
+from django.db import migrations, models
+
+
+# Trigram indexes back the contractor dashboard's icontains search.
+# They need the pg_trgm extension, so they are only created on PostgreSQL.
+TRIGRAM_INDEXES = [
+    ("tkt_num_trgm_idx", "ticket_number"),
+    ("tkt_cat_trgm_idx", "category"),
+]
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for name, column in TRIGRAM_INDEXES:
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {name} ON user_portal_ticket "
+            f"USING gin ({column} gin_trgm_ops)"
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name, _column in TRIGRAM_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("user_portal", "0005_add_resolved_at_to_ticket"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="ticket",
+            index=models.Index(
+                fields=["contractor", "status", "-created_at"],
+                name="user_portal_contrac_4d16b7_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="ticket",
+            index=models.Index(
+                fields=["contractor", "severity"],
+                name="user_portal_contrac_0884e5_idx",
+            ),
+        ),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,18 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("user_portal", "0006_ticket_contractor_dashboard_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="civiccomplaint",
+            index=models.Index(
+                condition=models.Q(is_submit=False),
+                fields=["created_at"],
+                name="idx_unsub_created",
+            ),
+        ),
+    ]
@@ -0,0 +1,29 @@
+from django.db import migrations
+
+
+# A BRIN index on the append-only created_at column serves the cleanup
+# command's date-range scan at a fraction of a B-tree's size. BRIN is
+# PostgreSQL-specific, so the index is only created there.
+def create_brin_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS cc_created_brin ON user_portal_civiccomplaint "
+        "USING brin (created_at)"
+    )
+
+
+def drop_brin_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS cc_created_brin")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("user_portal", "0007_partial_index_unsubmitted"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_brin_index, drop_brin_index),
+    ]
@@ -0,0 +1,41 @@
+from django.db import migrations
+
+
+# Covering index for TrackTicketView: the lookup by ticket_number can be
+# answered from the index leaf without a heap fetch. INCLUDE columns are
+# PostgreSQL-specific, so the index is only created there.
+TRACK_INCLUDE_COLUMNS = [
+    "status",
+    "category",
+    "department",
+    "severity",
+    "user_rating",
+    "contractor_id",
+    "ward_id",
+    "civic_complaint_id",
+]
+
+
+def create_covering_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS ticket_track_covering ON user_portal_ticket "
+        f"(ticket_number) INCLUDE ({', '.join(TRACK_INCLUDE_COLUMNS)})"
+    )
+
+
+def drop_covering_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS ticket_track_covering")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("user_portal", "0008_civiccomplaint_created_brin"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_covering_index, drop_covering_index),
+    ]
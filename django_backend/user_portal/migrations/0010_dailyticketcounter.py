@@ -0,0 +1,55 @@
+from datetime import datetime
+
+from django.db import migrations, models
+
+
+def seed_counters(apps, schema_editor):
+    """Start each day's counter at the highest ticket number already issued."""
+    Ticket = apps.get_model("user_portal", "Ticket")
+    DailyTicketCounter = apps.get_model("user_portal", "DailyTicketCounter")
+
+    counters = {}
+    for ticket_number in Ticket.objects.values_list("ticket_number", flat=True).iterator():
+        parts = ticket_number.split("-")
+        if len(parts) != 3 or not parts[1].isdigit() or not parts[2].isdigit():
+            continue
+        day = datetime.strptime(parts[1], "%Y%m%d").date()
+        counters[day] = max(counters.get(day, 0), int(parts[2]))
+
+    DailyTicketCounter.objects.bulk_create(
+        [DailyTicketCounter(date=day, counter=counter) for day, counter in counters.items()]
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("user_portal", "0009_ticket_track_covering_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyTicketCounter",
+            fields=[
+                (
+                    "date",
+                    models.DateField(
+                        help_text="Day the counter applies to",
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                (
+                    "counter",
+                    models.PositiveIntegerField(
+                        default=0,
+                        help_text="Last ticket counter issued on this day",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Daily Ticket Counter",
+                "verbose_name_plural": "Daily Ticket Counters",
+            },
+        ),
+        migrations.RunPython(seed_counters, migrations.RunPython.noop),
+    ]
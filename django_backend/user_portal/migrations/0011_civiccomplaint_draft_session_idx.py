@@ -0,0 +1,22 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("user_portal", "0010_dailyticketcounter"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="civiccomplaint",
+            name="user_portal_session_42c9aa_idx",
+        ),
+        migrations.AddIndex(
+            model_name="civiccomplaint",
+            index=models.Index(
+                condition=models.Q(is_submit=False),
+                fields=["session_id"],
+                name="draft_session_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("user_portal", "0011_civiccomplaint_draft_session_idx"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="ticket",
+            index=models.Index(
+                condition=models.Q(user_rating__isnull=False),
+                fields=["contractor", "user_rating"],
+                name="ticket_rated_contractor_idx",
+            ),
+        ),
+    ]
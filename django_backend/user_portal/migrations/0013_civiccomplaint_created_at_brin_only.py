@@ -0,0 +1,52 @@
+from django.db import migrations, models
+
+
+# On PostgreSQL the BRIN index from 0008 serves created_at range scans, so
+# the db_index B-tree on the same column only adds insert cost there; drop
+# it. Other databases have no BRIN and keep the B-tree in place.
+def _created_at_btree_name(apps, schema_editor):
+    CivicComplaint = apps.get_model("user_portal", "CivicComplaint")
+    return schema_editor._create_index_name(
+        CivicComplaint._meta.db_table, ["created_at"]
+    )
+
+
+def drop_created_at_btree(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    name = _created_at_btree_name(apps, schema_editor)
+    schema_editor.execute(f"DROP INDEX IF EXISTS {schema_editor.quote_name(name)}")
+
+
+def restore_created_at_btree(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    name = _created_at_btree_name(apps, schema_editor)
+    schema_editor.execute(
+        f"CREATE INDEX IF NOT EXISTS {schema_editor.quote_name(name)} "
+        "ON user_portal_civiccomplaint (created_at)"
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("user_portal", "0012_ticket_rated_contractor_idx"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name="civiccomplaint",
+                    name="created_at",
+                    field=models.DateTimeField(
+                        auto_now_add=True,
+                        help_text="When photo was captured",
+                    ),
+                ),
+            ],
+            database_operations=[
+                migrations.RunPython(drop_created_at_btree, restore_created_at_btree),
+            ],
+        ),
+    ]
@@ -0,0 +1,52 @@
+import uuid
+
+from django.db import migrations, models
+
+
+# session_id is only looked up on drafts, which draft_session_idx covers;
+# the full db_index B-tree on the column only adds write cost. It is
+# dropped by name rather than through AlterField so SQLite does not
+# rebuild the whole table.
+def _session_id_btree_name(apps, schema_editor):
+    CivicComplaint = apps.get_model("user_portal", "CivicComplaint")
+    return schema_editor._create_index_name(
+        CivicComplaint._meta.db_table, ["session_id"]
+    )
+
+
+def drop_session_id_btree(apps, schema_editor):
+    name = _session_id_btree_name(apps, schema_editor)
+    schema_editor.execute(f"DROP INDEX IF EXISTS {schema_editor.quote_name(name)}")
+
+
+def restore_session_id_btree(apps, schema_editor):
+    name = _session_id_btree_name(apps, schema_editor)
+    schema_editor.execute(
+        f"CREATE INDEX IF NOT EXISTS {schema_editor.quote_name(name)} "
+        "ON user_portal_civiccomplaint (session_id)"
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("user_portal", "0013_civiccomplaint_created_at_brin_only"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name="civiccomplaint",
+                    name="session_id",
+                    field=models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        help_text="Browser session identifier for tracking unsaved submissions",
+                    ),
+                ),
+            ],
+            database_operations=[
+                migrations.RunPython(drop_session_id_btree, restore_session_id_btree),
+            ],
+        ),
+    ]
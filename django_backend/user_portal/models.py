@@ -5,12 +5,15 @@ This module contains models for citizen-facing complaint submission and tracking
 Includes CivicComplaint (photo submissions) and Ticket (generated complaints).
 """
 
-import os
 import uuid
-from django.db import models
+from django.core.cache import cache
+from django.db import models, transaction
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.core.exceptions import ValidationError
 from django.utils import timezone
+from django.utils.functional import cached_property
+from user_portal.utils.background import run_in_background
+from admin_portal.tasks import schedule_rating_update
 
 
 def validate_image_size(image):
@@ -47,20 +50,29 @@ def civic_complaint_image_path(instance, filename):
     Returns:
         String path for file storage
     """
-    date = timezone.now()
-    ext = os.path.splitext(filename)[1]
-    new_filename = f"{uuid.uuid4()}{ext}"
-    
-    return os.path.join(
-        'complaints',
-        str(date.year),
-        str(date.month).zfill(2),
-        str(date.day).zfill(2),
-        str(instance.session_id),
-        new_filename
+    date = timezone.localdate()
+    _, dot, ext = filename.rpartition('.')
+    ext = f".{ext}" if dot else ''
+    
+    return (
+        f"complaints/{date.year}/{date.month:02d}/{date.day:02d}/"
+        f"{instance.session_id}/{uuid.uuid4().hex}{ext}"
     )
 
 
+def track_ticket_cache_key(ticket_number: str) -> str:
+    """
+    Build the cache key for a ticket's tracking page payload.
+    
+    Args:
+        ticket_number: Ticket number (e.g., CMP-20260110-001)
+    
+    Returns:
+        Cache key string
+    """
+    return f"track-ticket:{ticket_number}"
+
+
 class CivicComplaint(models.Model):
     """
     Represents a citizen's photo submission with location data.
@@ -77,11 +89,11 @@ class CivicComplaint(models.Model):
         4. If invalid → CivicComplaint deleted
     """
     
-    # Unique identifier for browser session tracking
+    # Unique identifier for browser session tracking (looked up only on
+    # drafts, through the draft_session_idx partial index)
     session_id = models.UUIDField(
         default=uuid.uuid4,
         editable=False,
-        db_index=True,
         help_text="Browser session identifier for tracking unsaved submissions"
     )
     
@@ -137,9 +149,10 @@ class CivicComplaint(models.Model):
     )
     
     # Audit timestamps
+    # Indexed by the cc_created_brin BRIN index on PostgreSQL; other
+    # databases keep the B-tree created by the initial migration
     created_at = models.DateTimeField(
         auto_now_add=True,
-        db_index=True,
         help_text="When photo was captured"
     )
     
@@ -152,7 +165,18 @@ class CivicComplaint(models.Model):
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['is_submit', 'created_at']),
-            models.Index(fields=['session_id', 'is_submit']),
+            # Partial index covering only drafts, for the submit lookup
+            models.Index(
+                fields=['session_id'],
+                name='draft_session_idx',
+                condition=models.Q(is_submit=False)
+            ),
+            # Partial index covering only drafts, for the daily cleanup scan
+            models.Index(
+                fields=['created_at'],
+                name='idx_unsub_created',
+                condition=models.Q(is_submit=False)
+            ),
         ]
         verbose_name = 'Civic Complaint'
         verbose_name_plural = 'Civic Complaints'
@@ -161,16 +185,29 @@ class CivicComplaint(models.Model):
         status = "Submitted" if self.is_submit else "Draft"
         return f"{status} - {self.area} - {self.created_at.strftime('%Y-%m-%d %H:%M')}"
     
+    @cached_property
+    def google_maps_url(self):
+        """Google Maps search link for the complaint location."""
+        return (
+            f"https://www.google.com/maps/search/?api=1"
+            f"&query={self.latitude},{self.longitude}"
+        )
+    
     def delete(self, *args, **kwargs):
         """
         Override delete to remove image file from storage.
+        
+        The file is removed through the storage backend (works for
+        non-local storage too) on a background worker once the row
+        deletion has committed.
         """
-        if self.image:
-            # Delete the physical file
-            if os.path.isfile(self.image.path):
-                os.remove(self.image.path)
+        image_name = self.image.name if self.image else None
+        storage = self.image.storage
         
         super().delete(*args, **kwargs)
+        
+        if image_name:
+            run_in_background(storage.delete, image_name)
 
 
 class Ticket(models.Model):
@@ -315,6 +352,15 @@ class Ticket(models.Model):
         indexes = [
             models.Index(fields=['status', 'created_at']),
             models.Index(fields=['department', 'status']),
+            # Contractor dashboard filters (status / severity within a contractor)
+            models.Index(fields=['contractor', 'status', '-created_at']),
+            models.Index(fields=['contractor', 'severity']),
+            # Rated tickets only, for the contractor average rating
+            models.Index(
+                fields=['contractor', 'user_rating'],
+                name='ticket_rated_contractor_idx',
+                condition=models.Q(user_rating__isnull=False)
+            ),
         ]
         verbose_name = 'Ticket'
         verbose_name_plural = 'Tickets'
@@ -322,6 +368,56 @@ class Ticket(models.Model):
     def __str__(self):
         return f"{self.ticket_number} - {self.category} ({self.status})"
     
+    # Fields whose previously saved values save() needs to compare against
+    TRACKED_FIELDS = ('status', 'user_rating')
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Remember tracked field values as loaded from the database.
+        
+        Lets save() detect status/rating transitions without
+        re-reading the row on every update.
+        """
+        instance = super().from_db(db, field_names, values)
+        loaded = dict(zip(field_names, values))
+        instance._loaded_values = {
+            name: loaded[name] for name in cls.TRACKED_FIELDS if name in loaded
+        }
+        return instance
+    
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        """
+        Reload fields and re-snapshot the tracked values that were reloaded.
+        
+        Without this save() would keep comparing against the values from
+        the original load and could mis-detect status/rating transitions.
+        """
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+        
+        refreshed = self.TRACKED_FIELDS if fields is None else set(fields) & set(self.TRACKED_FIELDS)
+        deferred = self.get_deferred_fields()
+        self._loaded_values = {
+            **getattr(self, '_loaded_values', {}),
+            **{name: getattr(self, name) for name in refreshed if name not in deferred},
+        }
+    
+    def _get_loaded_values(self):
+        """
+        Return the last saved status and user_rating.
+        
+        Empty for unsaved tickets. Falls back to a query only when the
+        values were not loaded (e.g. deferred via only()/defer()).
+        """
+        if self._state.adding:
+            return {}
+        
+        loaded = getattr(self, '_loaded_values', {})
+        if len(loaded) == len(self.TRACKED_FIELDS):
+            return loaded
+        
+        return Ticket.objects.filter(pk=self.pk).values(*self.TRACKED_FIELDS).first() or {}
+    
     def save(self, *args, **kwargs):
         """
         Override save to handle two concerns:
@@ -330,35 +426,58 @@ class Ticket(models.Model):
            - For new tickets saved as `RESOLVED`, set the timestamp.
            - For existing tickets changing to `RESOLVED`, set once (do not overwrite).
 
-        2) Update contractor average ratings when a user rating is newly added.
+        2) Queue a contractor average rating refresh when a user rating is newly added.
+        
+        Previous values come from the snapshot taken when the ticket was
+        loaded, so no extra SELECT is issued on the common update path.
         """
-        old_instance = None
-        if self.pk:
-            try:
-                old_instance = Ticket.objects.get(pk=self.pk)
-            except Ticket.DoesNotExist:
-                old_instance = None
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and not set(update_fields) & set(self.TRACKED_FIELDS):
+            # Neither status nor rating is being written
+            super().save(*args, **kwargs)
+            self._invalidate_tracking_cache()
+            return
+        
+        loaded = self._get_loaded_values()
 
         # Detect transition to RESOLVED and set resolved_at once
         status_now_resolved = self.status == 'RESOLVED'
-        status_was_resolved = bool(old_instance and old_instance.status == 'RESOLVED')
+        status_was_resolved = loaded.get('status') == 'RESOLVED'
         if status_now_resolved and not status_was_resolved and self.resolved_at is None:
             self.resolved_at = timezone.now()
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | {'resolved_at'}
 
         # Determine if this save introduces a new user rating for the contractor
-        is_new_rating = False
-        if self.contractor and self.user_rating is not None:
-            if old_instance is None:
-                # New ticket with an initial rating set
-                is_new_rating = True
-            else:
-                is_new_rating = old_instance.user_rating is None and self.user_rating is not None
+        # (for new tickets, any initial rating counts as new)
+        is_new_rating = (
+            self.contractor_id is not None
+            and self.user_rating is not None
+            and loaded.get('user_rating') is None
+        )
 
         super().save(*args, **kwargs)
+        self._invalidate_tracking_cache()
+        
+        # Saved values become the new baseline
+        self._loaded_values = {
+            name: getattr(self, name) for name in self.TRACKED_FIELDS
+        }
 
-        # Post-save: update contractor average rating if a new rating was added
+        # Post-save: queue contractor average rating refresh if a new rating
+        # was added (runs after commit, coalesced with other new ratings)
         if is_new_rating:
-            self.contractor.update_average_rating()
+            schedule_rating_update(self.contractor_id)
+    
+    def _invalidate_tracking_cache(self):
+        """
+        Drop the cached tracking payload once this save commits.
+        
+        Deleting after commit keeps a concurrent tracking request from
+        re-caching the old row before the new one is visible.
+        """
+        key = track_ticket_cache_key(self.ticket_number)
+        transaction.on_commit(lambda: cache.delete(key))
 
 
 class TicketNote(models.Model):
@@ -421,3 +540,30 @@ class TicketNote(models.Model):
     
     def __str__(self):
         return f"{self.ticket.ticket_number} - {self.note_type} - {self.created_at.strftime('%Y-%m-%d %H:%M')}"
+
+
+class DailyTicketCounter(models.Model):
+    """
+    Per-day counter backing ticket number generation.
+    
+    One row per date holds the last NNN issued in CMP-YYYYMMDD-NNN.
+    It is incremented with a single atomic upsert, so concurrent
+    submissions never scan or lock the Ticket table.
+    """
+    
+    date = models.DateField(
+        primary_key=True,
+        help_text="Day the counter applies to"
+    )
+    
+    counter = models.PositiveIntegerField(
+        default=0,
+        help_text="Last ticket counter issued on this day"
+    )
+    
+    class Meta:
+        verbose_name = 'Daily Ticket Counter'
+        verbose_name_plural = 'Daily Ticket Counters'
+    
+    def __str__(self):
+        return f"{self.date:%Y-%m-%d}: {self.counter}"
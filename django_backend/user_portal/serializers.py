@@ -7,6 +7,7 @@ and validating incoming request data.
 
 from rest_framework import serializers
 from user_portal.models import CivicComplaint, Ticket
+from user_portal.utils.image_validator import MAX_IMAGE_BYTES
 from admin_portal.models import Contractor, Ward
 
 
@@ -93,18 +94,67 @@ class TicketDetailSerializer(serializers.ModelSerializer):
             'updated_at'
         ]
     
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """
+        Join every relation this serializer reads, and only its columns.
+        
+        Image URL and the nested contractor/ward serializers each
+        dereference a foreign key, so without this every serialized
+        ticket costs three extra queries. The column list mirrors
+        Meta.fields and the nested serializers; extend it with them.
+        
+        Args:
+            queryset: Ticket queryset to serialize
+        
+        Returns:
+            Queryset with related objects loaded in the same query
+        """
+        return queryset.select_related(
+            'civic_complaint', 'contractor', 'ward'
+        ).only(
+            'ticket_number', 'status', 'severity', 'category', 'department',
+            'user_rating', 'created_at', 'updated_at',
+            'civic_complaint__image',
+            'contractor__contractor_name', 'contractor__contractor_phone',
+            'ward__ward_name', 'ward__ward_admin_name', 'ward__ward_admin_no'
+        )
+    
+    def to_representation(self, instance):
+        """
+        Resolve the scheme/host prefix once per request.
+        
+        The serializer instance is reused for every row of a list, so
+        image URLs become plain string concatenation.
+        """
+        if not hasattr(self, '_host_prefix'):
+            request = self.context.get('request')
+            self._host_prefix = (
+                request.build_absolute_uri('/')[:-1] if request else None
+            )
+        return super().to_representation(instance)
+    
     def get_image_url(self, obj):
         """
         Get complaint image URL for display.
         
+        Without a request in the context the storage URL is returned
+        as is, so the payload can be cached independently of the host.
+        
         Returns:
             Image URL string or None if no image
         """
-        if obj.civic_complaint and obj.civic_complaint.image:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.civic_complaint.image.url)
-        return None
+        if not obj.civic_complaint_id:
+            return None
+        image = obj.civic_complaint.image
+        if not image:
+            return None
+        
+        # Storages with absolute URLs (S3, CDN) need no host prefix
+        url = image.url
+        if self._host_prefix is None or not url.startswith('/'):
+            return url
+        return self._host_prefix + url
     
     def get_can_rate(self, obj):
         """
@@ -133,19 +183,36 @@ class PhotoCaptureSerializer(serializers.Serializer):
         help_text="Base64-encoded image data"
     )
     
-    latitude = serializers.DecimalField(
-        max_digits=10,
-        decimal_places=7,
+    latitude = serializers.FloatField(
+        min_value=-90.0,
+        max_value=90.0,
         required=True,
         help_text="GPS latitude coordinate"
     )
     
-    longitude = serializers.DecimalField(
-        max_digits=10,
-        decimal_places=7,
+    longitude = serializers.FloatField(
+        min_value=-180.0,
+        max_value=180.0,
         required=True,
         help_text="GPS longitude coordinate"
     )
+    
+    def validate_image_base64(self, value):
+        """
+        Reject oversized images from the encoded length alone.
+        
+        Every 4 base64 characters decode to 3 bytes, so the decoded size
+        is known before any decoding work is done.
+        """
+        # Skip data URI prefix if present (without copying the string)
+        payload_length = len(value) - (value.find(',') + 1)
+        estimated_bytes = payload_length * 3 // 4
+        
+        if estimated_bytes > MAX_IMAGE_BYTES:
+            raise serializers.ValidationError(
+                f"Image size {estimated_bytes / (1024 * 1024):.2f}MB exceeds 5MB limit"
+            )
+        return value
 
 
 class SubmitComplaintSerializer(serializers.Serializer):
@@ -0,0 +1,69 @@
+"""
+Shared test fixtures.
+
+Factory helpers that create the smallest valid rows the apps' tests
+need. Each accepts keyword overrides for any model field.
+"""
+
+import itertools
+
+from admin_portal.models import Contractor, TicketCompletion
+from user_portal.models import CivicComplaint, Ticket
+
+
+# Distinct ticket numbers for tickets created without an explicit one
+_ticket_sequence = itertools.count(1)
+
+
+def create_complaint(**overrides) -> CivicComplaint:
+    """Create a submitted complaint at a fixed location."""
+    fields = {
+        'image': 'complaints/photo.jpg',
+        'area': 'Satellite',
+        'latitude': '23.0225000',
+        'longitude': '72.5714000',
+        'is_submit': True,
+    }
+    fields.update(overrides)
+    return CivicComplaint.objects.create(**fields)
+
+
+def create_contractor(**overrides) -> Contractor:
+    """Create a roads contractor with no ratings."""
+    fields = {
+        'contractor_name': 'ABC Contractors',
+        'contractor_phone': '9876543210',
+        'contractor_email': 'abc@example.com',
+        'department': 'Roads & Infrastructure',
+    }
+    fields.update(overrides)
+    return Contractor.objects.create(**fields)
+
+
+def create_ticket(**overrides) -> Ticket:
+    """Create a ticket, with a new complaint unless one is given."""
+    fields = {
+        'ticket_number': f"CMP-20260110-{next(_ticket_sequence):03d}",
+        'severity': 'High',
+        'category': 'Pothole',
+        'department': 'Roads & Infrastructure',
+        'status': 'SUBMITTED',
+    }
+    fields.update(overrides)
+    if 'civic_complaint' not in fields:
+        fields['civic_complaint'] = create_complaint()
+    return Ticket.objects.create(**fields)
+
+
+def create_completion(ticket: Ticket, **overrides) -> TicketCompletion:
+    """Create a work completion for a ticket by its assigned contractor."""
+    fields = {
+        'ticket': ticket,
+        'contractor': ticket.contractor,
+        'after_image': 'contractor_work/after.jpg',
+        'contractor_latitude': '23.0225000',
+        'contractor_longitude': '72.5714000',
+        'distance_from_original': '12.50',
+    }
+    fields.update(overrides)
+    return TicketCompletion.objects.create(**fields)
@@ -1,3 +1,274 @@
-from django.test import TestCase
+import base64
+import io
+import shutil
+import tempfile
+from datetime import date
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient, APIRequestFactory
+
+from user_portal.models import CivicComplaint, DailyTicketCounter, Ticket
+from user_portal.serializers import TicketDetailSerializer
+from user_portal.testing import create_complaint, create_contractor, create_ticket
+from user_portal.utils.ticket_generator import generate_ticket_number, generate_ticket_numbers
+
+
+class TicketNumberGenerationTests(TestCase):
+    """Ticket numbers come from the per-day DailyTicketCounter upsert."""
+
+    def test_numbers_continue_across_calls_on_same_day(self):
+        prefix = f"CMP-{date.today().strftime('%Y%m%d')}-"
+
+        first_block = generate_ticket_numbers(2)
+        next_number = generate_ticket_number()
+
+        self.assertEqual(first_block, [f"{prefix}001", f"{prefix}002"])
+        self.assertEqual(next_number, f"{prefix}003")
+        self.assertEqual(DailyTicketCounter.objects.get(date=date.today()).counter, 3)
+
+
+class CleanupUnsubmittedComplaintsTests(TestCase):
+    """Non-dry-run cleanup deletes today's drafts and only their photos."""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def _create_with_photo(self, is_submit):
+        return create_complaint(
+            image=SimpleUploadedFile('photo.jpg', b'image-bytes'),
+            is_submit=is_submit
+        )
+
+    def test_deletes_drafts_and_their_photos(self):
+        draft = self._create_with_photo(is_submit=False)
+        submitted = self._create_with_photo(is_submit=True)
+
+        with mock.patch('builtins.input', return_value='y'):
+            call_command('cleanup_unsubmitted_complaints', stdout=io.StringIO())
+
+        self.assertFalse(CivicComplaint.objects.filter(pk=draft.pk).exists())
+        self.assertFalse(draft.image.storage.exists(draft.image.name))
+        self.assertTrue(CivicComplaint.objects.filter(pk=submitted.pk).exists())
+        self.assertTrue(submitted.image.storage.exists(submitted.image.name))
+
+    def test_keeps_draft_submitted_while_awaiting_confirmation(self):
+        draft = self._create_with_photo(is_submit=False)
+
+        def submit_then_confirm(prompt):
+            CivicComplaint.objects.filter(pk=draft.pk).update(is_submit=True)
+            return 'y'
+
+        with mock.patch('builtins.input', side_effect=submit_then_confirm):
+            call_command('cleanup_unsubmitted_complaints', stdout=io.StringIO())
+
+        self.assertTrue(CivicComplaint.objects.filter(pk=draft.pk).exists())
+        self.assertTrue(draft.image.storage.exists(draft.image.name))
+
+
+class CapturePhotoViewTests(TestCase):
+    """Photo capture rejects bad uploads with a 400."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse('user_portal:capture_photo')
+
+        geocode_patch = mock.patch('user_portal.views.submit_geocode')
+        self.submit_geocode = geocode_patch.start()
+        self.addCleanup(geocode_patch.stop)
+
+    def _post(self, image_base64):
+        return self.client.post(self.url, {
+            'image_base64': image_base64,
+            'latitude': 23.0225,
+            'longitude': 72.5714
+        }, format='json')
+
+    def test_non_ascii_payload_is_rejected(self):
+        response = self._post('data:image/jpeg;base64,' + '\u00e9' * 64)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['error'], 'Invalid base64 encoding')
+
+    def test_invalid_base64_is_rejected(self):
+        response = self._post('not*base64*at*all')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['error'], 'Invalid base64 encoding')
+
+    def test_rejected_image_is_not_geocoded(self):
+        response = self._post(base64.b64encode(b'not an image').decode('ascii'))
+
+        self.assertEqual(response.status_code, 400)
+        self.submit_geocode.assert_not_called()
+
+
+@mock.patch('user_portal.views.SubmitComplaintView._call_ai_validation')
+class SubmitComplaintViewTests(TestCase):
+    """Submitting a draft claims it once and turns it into tickets."""
+
+    VALID_RESPONSE = {
+        'is_valid': True,
+        'data': [
+            {'severity': 'High', 'category': 'Pothole', 'department': 'Roads & Infrastructure'},
+            {'severity': 'Low', 'category': 'Garbage', 'department': 'Sanitation'},
+        ],
+        'error_message': None
+    }
+
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse('user_portal:submit_complaint')
+        self.draft = create_complaint(is_submit=False)
+
+    def _submit(self):
+        return self.client.post(self.url, {'complaint_id': self.draft.id}, format='json')
+
+    def test_valid_draft_creates_tickets(self, call_ai_validation):
+        call_ai_validation.return_value = self.VALID_RESPONSE
+
+        response = self._submit()
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.data['tickets']), 2)
+        self.assertEqual(Ticket.objects.filter(civic_complaint=self.draft).count(), 2)
+        self.draft.refresh_from_db()
+        self.assertTrue(self.draft.is_submit)
+        self.assertTrue(self.draft.is_valid)
+
+    def test_draft_claimed_concurrently_returns_404(self, call_ai_validation):
+        def submitted_elsewhere(complaint):
+            CivicComplaint.objects.filter(pk=complaint.pk).update(is_submit=True)
+            return self.VALID_RESPONSE
+
+        call_ai_validation.side_effect = submitted_elsewhere
+
+        response = self._submit()
+
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(Ticket.objects.exists())
+
+    def test_submitted_complaint_returns_404(self, call_ai_validation):
+        CivicComplaint.objects.filter(pk=self.draft.pk).update(is_submit=True)
+
+        response = self._submit()
+
+        self.assertEqual(response.status_code, 404)
+        call_ai_validation.assert_not_called()
+
+    def test_missing_complaint_returns_404(self, call_ai_validation):
+        response = self.client.post(self.url, {'complaint_id': self.draft.id + 1}, format='json')
+
+        self.assertEqual(response.status_code, 404)
+        call_ai_validation.assert_not_called()
+
+    @mock.patch('user_portal.views.run_in_background')
+    def test_invalid_draft_is_deleted_with_its_photo(self, run_in_background, call_ai_validation):
+        call_ai_validation.return_value = {
+            'is_valid': False,
+            'data': [],
+            'error_message': 'No civic issue detected'
+        }
+
+        response = self._submit()
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(CivicComplaint.objects.filter(pk=self.draft.pk).exists())
+        run_in_background.assert_called_once_with(
+            self.draft.image.storage.delete, self.draft.image.name
+        )
+
+
+class TicketDetailSerializerTests(TestCase):
+    """Complaint image URLs are absolute for the requesting host."""
+
+    def setUp(self):
+        self.ticket = create_ticket()
+        self.request = APIRequestFactory().get('/api/user/track-ticket/')
+
+    def _image_url(self):
+        serializer = TicketDetailSerializer(self.ticket, context={'request': self.request})
+        return serializer.data['image_url']
+
+    @override_settings(MEDIA_URL='/media/')
+    def test_relative_storage_url_gets_request_host(self):
+        self.assertEqual(self._image_url(), 'http://testserver/media/complaints/photo.jpg')
+
+    @override_settings(MEDIA_URL='https://cdn.example.com/media/')
+    def test_absolute_storage_url_is_returned_unchanged(self):
+        self.assertEqual(self._image_url(), 'https://cdn.example.com/media/complaints/photo.jpg')
+
+
+@override_settings(ALLOWED_HOSTS=['*'], MEDIA_URL='/media/')
+class TrackTicketViewTests(TestCase):
+    """Tracking responses are cached per ticket and dropped on save."""
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+        self.client = APIClient()
+        self.url = reverse('user_portal:track_ticket')
+        self.ticket = create_ticket()
+
+    def _track(self, host='testserver'):
+        response = self.client.get(
+            self.url, {'ticket_number': self.ticket.ticket_number}, HTTP_HOST=host
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.data['ticket']
+
+    def test_repeat_requests_are_served_from_cache(self):
+        self._track()
+        Ticket.objects.filter(pk=self.ticket.pk).update(status='IN_PROGRESS')
+
+        self.assertEqual(self._track()['status'], 'SUBMITTED')
+
+    def test_save_invalidates_cached_ticket(self):
+        self._track()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.ticket.status = 'ASSIGNED'
+            self.ticket.save()
+
+        self.assertEqual(self._track()['status'], 'ASSIGNED')
+
+    def test_cached_image_url_uses_each_requests_host(self):
+        first = self._track(host='first.example.com')
+        second = self._track(host='second.example.com')
+
+        self.assertEqual(first['image_url'], 'http://first.example.com/media/complaints/photo.jpg')
+        self.assertEqual(second['image_url'], 'http://second.example.com/media/complaints/photo.jpg')
+
+
+class TicketTransitionTrackingTests(TestCase):
+    """save() compares against the values last read from the database."""
+
+    def test_refresh_resets_status_snapshot(self):
+        ticket = create_ticket(status='IN_PROGRESS')
+        Ticket.objects.filter(pk=ticket.pk).update(status='RESOLVED')
+
+        ticket.refresh_from_db()
+        ticket.save(update_fields=['status'])
+
+        # Already RESOLVED in the database, so this is not a transition
+        self.assertIsNone(Ticket.objects.get(pk=ticket.pk).resolved_at)
+
+    @mock.patch('user_portal.models.schedule_rating_update')
+    def test_refresh_resets_rating_snapshot(self, schedule_rating_update):
+        ticket = create_ticket(status='RESOLVED', contractor=create_contractor())
+        Ticket.objects.filter(pk=ticket.pk).update(user_rating=5)
+
+        ticket.refresh_from_db(fields=['user_rating'])
+        ticket.save(update_fields=['user_rating', 'updated_at'])
+
+        schedule_rating_update.assert_not_called()
@@ -0,0 +1,75 @@
+"""
+Background task utilities.
+
+Runs slow, non-critical work (AI calls, file cleanup) on a small
+per-process thread pool so the HTTP worker can respond immediately.
+Tasks are dispatched only after the surrounding database transaction
+commits, so they always see the rows the request just wrote.
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+
+logger = logging.getLogger(__name__)
+
+
+# Shared worker pool for this process
+_executor = ThreadPoolExecutor(
+    max_workers=getattr(settings, 'BACKGROUND_TASK_WORKERS', 4),
+    thread_name_prefix='background-task'
+)
+
+
+def _run_task(func: Callable[..., Any], args: tuple, kwargs: dict) -> None:
+    """
+    Execute a task on a worker thread.
+
+    Database connections are per-thread in Django, so stale connections
+    are released before and after each task.
+    """
+    close_old_connections()
+    try:
+        func(*args, **kwargs)
+    except Exception:
+        logger.exception(f"Background task {func.__name__} failed")
+    finally:
+        close_old_connections()
+
+
+def submit_background(func: Callable[..., Any], *args: Any, **kwargs: Any) -> None:
+    """
+    Submit a function to the background pool immediately.
+    
+    Unlike run_in_background() this does not wait for the surrounding
+    transaction; use it from on_commit callbacks that have already
+    waited.
+    
+    Args:
+        func: Callable to execute
+        *args: Positional arguments for func
+        **kwargs: Keyword arguments for func
+    """
+    _executor.submit(_run_task, func, args, kwargs)
+
+
+def run_in_background(func: Callable[..., Any], *args: Any, **kwargs: Any) -> None:
+    """
+    Schedule a function to run on the background pool after commit.
+
+    If called outside a transaction the task is submitted immediately.
+
+    Args:
+        func: Callable to execute
+        *args: Positional arguments for func
+        **kwargs: Keyword arguments for func
+
+    Example:
+        >>> run_in_background(verify_completion, completion.id)
+    """
+    transaction.on_commit(
+        lambda: submit_background(func, *args, **kwargs)
+    )
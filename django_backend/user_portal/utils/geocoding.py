@@ -7,38 +7,111 @@ Gujarat, India region.
 """
 
 import logging
-from typing import Dict, Optional
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import Dict, Iterable, List, Optional, Tuple
+from django.conf import settings
+from django.core.cache import cache
+from geopy.adapters import RequestsAdapter
 from geopy.geocoders import Nominatim
 from geopy.exc import GeocoderTimedOut, GeocoderServiceError
+from geopy.extra.rate_limiter import RateLimiter
 
 
 logger = logging.getLogger(__name__)
 
 
+# Cached in place of an address when Nominatim has none for a location
+# (kept for GEOCODE_MISS_TTL, shorter than found addresses)
+GEOCODE_MISS = '__MISS__'
+
+# Resolved cells kept in each process's in-memory lookup table
+LOCAL_TABLE_SIZE = 4096
+
+
+def geocode_cache_key(latitude: float, longitude: float) -> str:
+    """
+    Build the cache key for a coordinate pair.
+    
+    Coordinates are rounded to 4 decimals (~11 m), so repeated captures
+    of the same spot share one entry.
+    """
+    return f"geo:{round(latitude, 4)}:{round(longitude, 4)}"
+
+
 class GeocodeService:
     """
     Service for converting GPS coordinates to address components.
     
     Uses OpenStreetMap's Nominatim geocoding service (free tier).
-    Implements retry logic for transient failures.
+    Requests are rate limited per process and retried with backoff.
     """
     
-    def __init__(self):
+    # Nominatim address keys tried in priority order
+    STREET_FIELDS = ('road', 'neighbourhood', 'suburb', 'residential')
+    AREA_FIELDS = ('neighbourhood', 'suburb', 'city_district', 'residential')
+    
+    def __init__(self, max_retries: int = 3):
         """
         Initialize geocoder with user agent.
         
         Nominatim requires a unique user agent to identify your application.
+        HTTP goes through a pooled requests session owned by the adapter,
+        so keep-alive connections are reused for the life of the service.
+        The request timeout comes from NOMINATIM_TIMEOUT (default 15s).
+        
+        Args:
+            max_retries: Maximum attempts per lookup for API failures
         """
+        self.max_retries = max_retries
         self.geocoder = Nominatim(
             user_agent="civic_complaint_system_ahmedabad_v1.0",
-            timeout=10
+            timeout=settings.NOMINATIM_TIMEOUT,
+            adapter_factory=partial(
+                RequestsAdapter,
+                pool_connections=4,
+                pool_maxsize=16
+            )
+        )
+        
+        # Nominatim's usage policy allows ~1 request/second. The limiter
+        # spaces calls across threads and waits before retrying errors
+        # (RateLimiter counts retries after the first attempt).
+        self._reverse = RateLimiter(
+            self.geocoder.reverse,
+            min_delay_seconds=1.0 / settings.NOMINATIM_QPS,
+            max_retries=max_retries - 1,
+            error_wait_seconds=5.0,
+            swallow_exceptions=False
         )
+        
+        # In-process table of recently resolved cells, checked before the
+        # shared cache (bounded, least recently used evicted first)
+        self._local_addresses = OrderedDict()
+        self._local_lock = threading.Lock()
+    
+    def _get_local(self, cache_key: str) -> Optional[Dict[str, str]]:
+        """Return an address from the in-process table, if present."""
+        with self._local_lock:
+            result = self._local_addresses.get(cache_key)
+            if result is not None:
+                self._local_addresses.move_to_end(cache_key)
+            return result
+    
+    def _set_local(self, cache_key: str, result: Dict[str, str]) -> None:
+        """Store an address in the in-process table, evicting the oldest."""
+        with self._local_lock:
+            self._local_addresses[cache_key] = result
+            self._local_addresses.move_to_end(cache_key)
+            if len(self._local_addresses) > LOCAL_TABLE_SIZE:
+                self._local_addresses.popitem(last=False)
     
     def reverse_geocode(
         self,
         latitude: float,
-        longitude: float,
-        max_retries: int = 3
+        longitude: float
     ) -> Optional[Dict[str, str]]:
         """
         Convert coordinates to address components.
@@ -46,7 +119,6 @@ class GeocodeService:
         Args:
             latitude: GPS latitude coordinate
             longitude: GPS longitude coordinate
-            max_retries: Maximum retry attempts for API failures
         
         Returns:
             Dictionary with address components:
@@ -62,74 +134,108 @@ class GeocodeService:
         
         Note:
             Nominatim is a free service with usage limits.
+            Results (and empty results) are cached per ~11 m cell, so
+            repeated coordinates do not hit the service again.
             For production, consider:
-            - Caching results
-            - Rate limiting requests
             - Using paid geocoding services for higher reliability
         """
-        retry_count = 0
-        
-        while retry_count < max_retries:
-            try:
-                # Query Nominatim with coordinates
-                location = self.geocoder.reverse(
-                    f"{latitude}, {longitude}",
-                    language='en',
-                    addressdetails=True
-                )
-                
-                if location is None:
-                    logger.warning(
-                        f"No address found for coordinates: {latitude}, {longitude}"
-                    )
-                    return None
-                
-                # Extract address components
-                address = location.raw.get('address', {})
-                
-                # Parse address components with fallbacks
-                street = self._extract_street(address)
-                area = self._extract_area(address)
-                postal_code = address.get('postcode', '')
-                
-                result = {
-                    'street': street,
-                    'area': area,
-                    'postal_code': postal_code,
-                    'city': address.get('city', 'Ahmedabad'),
-                    'state': address.get('state', 'Gujarat'),
-                    'country': address.get('country', 'India')
-                }
-                
-                logger.info(
-                    f"Geocoded coordinates ({latitude}, {longitude}) "
-                    f"to: {area}, {result['city']}"
-                )
-                
-                return result
-            
-            except GeocoderTimedOut:
-                retry_count += 1
-                logger.warning(
-                    f"Geocoding timeout (attempt {retry_count}/{max_retries})"
-                )
-                
-                if retry_count >= max_retries:
-                    logger.error(
-                        f"Geocoding failed after {max_retries} attempts "
-                        f"for coordinates: {latitude}, {longitude}"
-                    )
-                    return None
-            
-            except GeocoderServiceError as e:
-                logger.error(f"Geocoding service error: {str(e)}")
-                return None
-            
-            except Exception as e:
-                logger.error(f"Unexpected geocoding error: {str(e)}")
-                return None
-        
-        return None
+        cache_key = geocode_cache_key(latitude, longitude)
+        local = self._get_local(cache_key)
+        if local is not None:
+            return local
+        
+        cached = cache.get(cache_key)
+        if cached == GEOCODE_MISS:
+            return None
+        if cached is not None:
+            self._set_local(cache_key, cached)
+            return cached
+        
+        try:
+            # Query Nominatim with coordinates (rate limited, retried)
+            location = self._reverse(
+                f"{latitude}, {longitude}",
+                language='en',
+                addressdetails=True
+            )
+        
+        except GeocoderTimedOut:
+            logger.error(
+                f"Geocoding failed after {self.max_retries} attempts "
+                f"for coordinates: {latitude}, {longitude}"
+            )
+            return None
+        
+        except GeocoderServiceError as e:
+            logger.error(f"Geocoding service error: {str(e)}")
+            return None
+        
+        except Exception as e:
+            logger.error(f"Unexpected geocoding error: {str(e)}")
+            return None
+        
+        if location is None:
+            logger.warning(
+                f"No address found for coordinates: {latitude}, {longitude}"
+            )
+            cache.set(cache_key, GEOCODE_MISS, settings.GEOCODE_MISS_TTL)
+            return None
+        
+        # Extract address components
+        address = location.raw.get('address', {})
+        
+        # Parse address components with fallbacks
+        street = self._extract_street(address)
+        area = self._extract_area(address)
+        postal_code = address.get('postcode', '')
+        
+        result = {
+            'street': street,
+            'area': area,
+            'postal_code': postal_code,
+            'city': address.get('city', 'Ahmedabad'),
+            'state': address.get('state', 'Gujarat'),
+            'country': address.get('country', 'India')
+        }
+        
+        logger.info(
+            f"Geocoded coordinates ({latitude}, {longitude}) "
+            f"to: {area}, {result['city']}"
+        )
+        
+        cache.set(cache_key, result, settings.GEOCODE_CACHE_TTL)
+        self._set_local(cache_key, result)
+        
+        return result
+    
+    def reverse_geocode_many(
+        self,
+        coords: Iterable[Tuple[float, float]],
+        max_workers: int = 4
+    ) -> List[Optional[Dict[str, str]]]:
+        """
+        Reverse geocode several coordinate pairs concurrently.
+        
+        Lookups overlap their network round-trips on a small thread pool
+        instead of running one after another. Each lookup goes through
+        reverse_geocode, so caching and retries still apply.
+        
+        Args:
+            coords: Iterable of (latitude, longitude) pairs
+            max_workers: Maximum concurrent Nominatim requests
+        
+        Returns:
+            List of address dictionaries (or None) in input order
+        """
+        coords = list(coords)
+        if not coords:
+            return []
+        
+        with ThreadPoolExecutor(
+            max_workers=min(max_workers, len(coords)),
+            thread_name_prefix='geocode'
+        ) as executor:
+            return list(executor.map(lambda c: self.reverse_geocode(*c), coords))
     
     def _extract_street(self, address: Dict) -> str:
         """
@@ -138,13 +244,10 @@ class GeocodeService:
         Tries multiple fields in priority order:
         road > neighbourhood > suburb > residential
         """
-        street_fields = ['road', 'neighbourhood', 'suburb', 'residential']
-        
-        for field in street_fields:
-            if field in address and address[field]:
-                return address[field]
-        
-        return ''
+        return next(
+            (address[field] for field in self.STREET_FIELDS if address.get(field)),
+            ''
+        )
     
     def _extract_area(self, address: Dict) -> str:
         """
@@ -153,31 +256,34 @@ class GeocodeService:
         Tries multiple fields in priority order:
         neighbourhood > suburb > city_district > residential
         """
-        area_fields = ['neighbourhood', 'suburb', 'city_district', 'residential']
-        
-        for field in area_fields:
-            if field in address and address[field]:
-                return address[field]
-        
         # Fallback to city if no area found
-        return address.get('city', 'Ahmedabad')
+        return next(
+            (address[field] for field in self.AREA_FIELDS if address.get(field)),
+            address.get('city', 'Ahmedabad')
+        )
 
 
 # Singleton instance for reuse
 _geocode_service = None
+_geocode_service_lock = threading.Lock()
 
 
 def get_geocode_service() -> GeocodeService:
     """
     Get or create singleton GeocodeService instance.
     
+    Creation is locked so concurrent request threads share one service
+    (and its connection pool and rate limiter) per process.
+    
     Returns:
         GeocodeService instance
     """
     global _geocode_service
     
     if _geocode_service is None:
-        _geocode_service = GeocodeService()
+        with _geocode_service_lock:
+            if _geocode_service is None:
+                _geocode_service = GeocodeService()
     
     return _geocode_service
 
@@ -195,3 +301,68 @@ def geocode_coordinates(latitude: float, longitude: float) -> Optional[Dict[str,
     """
     service = get_geocode_service()
     return service.reverse_geocode(latitude, longitude)
+
+
+# Worker threads for lookups that overlap with other request work
+_lookup_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='geocode-lookup')
+
+
+def submit_geocode(latitude: float, longitude: float) -> Future:
+    """
+    Start reverse geocoding on a worker thread.
+    
+    Lets a view do CPU-bound work (e.g. image conversion) while the
+    Nominatim round-trip is in flight.
+    
+    Args:
+        latitude: GPS latitude
+        longitude: GPS longitude
+    
+    Returns:
+        Future resolving to the address dictionary or None
+    
+    Example:
+        >>> location_future = submit_geocode(23.0225, 72.5714)
+        >>> ...  # other work
+        >>> location_data = location_future.result()
+    """
+    return _lookup_executor.submit(geocode_coordinates, latitude, longitude)
+
+
+def bulk_reverse_geocode(
+    coords: Iterable[Tuple[float, float]]
+) -> Dict[Tuple[float, float], Optional[Dict[str, str]]]:
+    """
+    Reverse geocode many coordinates with one cache round-trip.
+    
+    Coordinates are rounded to the cache cell (4 decimals) and
+    de-duplicated, cached cells are fetched with a single get_many(),
+    and only the remaining cells are sent to Nominatim (concurrently,
+    within the rate limit).
+    
+    Args:
+        coords: Iterable of (latitude, longitude) pairs
+    
+    Returns:
+        Dictionary mapping each rounded (latitude, longitude) pair to its
+        address dictionary, or None if no address was found
+    
+    Example:
+        >>> addresses = bulk_reverse_geocode([(23.0225, 72.5714), (23.03, 72.58)])
+        >>> addresses[(23.0225, 72.5714)]['area']
+        'Navrangpura'
+    """
+    cells = {(round(lat, 4), round(lon, 4)) for lat, lon in coords}
+    keys = {geocode_cache_key(lat, lon): (lat, lon) for lat, lon in cells}
+    
+    results = {}
+    for key, cached in cache.get_many(keys.keys()).items():
+        results[keys[key]] = None if cached == GEOCODE_MISS else cached
+    
+    misses = [cell for cell in cells if cell not in results]
+    if misses:
+        # reverse_geocode stores each new result in the cache itself
+        service = get_geocode_service()
+        results.update(zip(misses, service.reverse_geocode_many(misses)))
+    
+    return results
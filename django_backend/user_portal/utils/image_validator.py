@@ -5,10 +5,11 @@ This module provides utilities for validating and processing base64-encoded
 images, including size validation and conversion to Django ImageField format.
 """
 
-import base64
 import logging
 import io
-from typing import Tuple, Optional
+import tempfile
+import pybase64
+from typing import BinaryIO, Tuple, Optional, Union
 from django.core.files.uploadedfile import InMemoryUploadedFile
 from PIL import Image
 
@@ -16,6 +17,134 @@ from PIL import Image
 logger = logging.getLogger(__name__)
 
 
+# Image formats accepted from photo capture
+VALID_FORMATS = ('JPEG', 'PNG', 'WEBP')
+
+# Maximum decoded image size (5MB)
+MAX_IMAGE_BYTES = 5 * 1024 * 1024
+
+# Base64 characters decoded per step when streaming (64KB of image data)
+DECODE_CHUNK_CHARS = 64 * 1024 // 3 * 4
+
+
+def decode_base64(base64_string: str) -> bytes:
+    """
+    Decode a base64 image string to raw bytes.
+    
+    Args:
+        base64_string: Base64-encoded image (with or without data URI prefix)
+    
+    Returns:
+        Decoded image bytes
+    
+    Raises:
+        ValueError: If the string contains non-ASCII or non-base64
+            characters, or has incorrect padding (binascii.Error is a
+            ValueError subclass)
+    """
+    # Remove data URI prefix if present. find() stops at the prefix's
+    # comma, and a single slice replaces the membership test + split()
+    # that scanned (and copied) the whole payload twice.
+    prefix_end = base64_string.find(',')
+    if prefix_end != -1:
+        base64_string = base64_string[prefix_end + 1:]
+    
+    # Decode base64 (SIMD-accelerated drop-in for base64.b64decode).
+    # Strict mode rejects non-alphabet characters up front instead of
+    # silently skipping them and decoding the rest.
+    return pybase64.b64decode(base64_string, validate=True)
+
+
+def decode_base64_to_file(base64_string: str) -> BinaryIO:
+    """
+    Decode a base64 image string into a temporary file, chunk by chunk.
+    
+    Only one chunk of decoded bytes is held in memory at a time, instead
+    of a second full-size copy of the image next to the encoded string.
+    
+    Args:
+        base64_string: Base64-encoded image (with or without data URI prefix)
+    
+    Returns:
+        Temporary file positioned at the start of the decoded image.
+        The caller must close it (it is deleted on close).
+    
+    Raises:
+        ValueError: If the string contains non-ASCII or non-base64
+            characters, or has incorrect padding (binascii.Error is a
+            ValueError subclass)
+    """
+    # Skip data URI prefix if present (without copying the payload)
+    start = base64_string.find(',') + 1
+    
+    image_file = tempfile.TemporaryFile()
+    try:
+        # Chunks are a multiple of 4 characters, so each one decodes
+        # independently; only the last may carry padding
+        for offset in range(start, len(base64_string), DECODE_CHUNK_CHARS):
+            chunk = base64_string[offset:offset + DECODE_CHUNK_CHARS]
+            image_file.write(pybase64.b64decode(chunk, validate=True))
+    except Exception:
+        image_file.close()
+        raise
+    
+    image_file.seek(0)
+    return image_file
+
+
+def validate_and_open(
+    image_data: Union[bytes, BinaryIO]
+) -> Tuple[bool, Optional[str], Optional[Image.Image]]:
+    """
+    Validate decoded image data and open it with Pillow.
+    
+    Checks:
+    - Image size <= 5MB
+    - Valid image format (JPEG, PNG, WebP)
+    
+    The opened image is returned so callers can convert it without
+    decoding or parsing the data a second time. A file argument must
+    stay open until the image has been converted.
+    
+    Args:
+        image_data: Decoded image bytes, or a binary file containing them
+    
+    Returns:
+        Tuple of (is_valid, error_message, image)
+        - (True, None, image) if valid
+        - (False, error_message, None) if invalid
+    """
+    if isinstance(image_data, bytes):
+        size = len(image_data)
+        image_stream = io.BytesIO(image_data)
+    else:
+        size = image_data.seek(0, io.SEEK_END)
+        image_data.seek(0)
+        image_stream = image_data
+    
+    # Check size (5MB limit)
+    if size > MAX_IMAGE_BYTES:
+        size_mb = size / (1024 * 1024)
+        return False, f"Image size {size_mb:.2f}MB exceeds 5MB limit", None
+    
+    # Validate it's a valid image from its header alone; pixel data is
+    # decoded once, later, when the image is converted for storage
+    try:
+        img = Image.open(image_stream)
+    
+    except Image.DecompressionBombError:
+        return False, "Image dimensions are too large", None
+    
+    except Exception as e:
+        return False, f"Invalid image data: {str(e)}", None
+    
+    # Check format
+    if img.format not in VALID_FORMATS:
+        return False, f"Invalid image format. Allowed: {', '.join(VALID_FORMATS)}", None
+    
+    return True, None, img
+
+
 def validate_base64_image(base64_string: str) -> Tuple[bool, Optional[str]]:
     """
     Validate base64-encoded image string.
@@ -38,36 +167,19 @@ def validate_base64_image(base64_string: str) -> Tuple[bool, Optional[str]]:
         >>> if not is_valid:
         ...     print(error)
     """
+    # Every 4 base64 characters decode to 3 bytes, so oversized payloads
+    # are rejected before any decoding (data URI prefix skipped)
+    estimated_bytes = (len(base64_string) - (base64_string.find(',') + 1)) * 3 // 4
+    if estimated_bytes > MAX_IMAGE_BYTES:
+        size_mb = estimated_bytes / (1024 * 1024)
+        return False, f"Image size {size_mb:.2f}MB exceeds 5MB limit"
+    
     try:
-        # Remove data URI prefix if present
-        if ',' in base64_string:
-            base64_string = base64_string.split(',')[1]
-        
-        # Decode base64
-        image_data = base64.b64decode(base64_string)
-        
-        # Check size (5MB limit)
-        max_size_bytes = 5 * 1024 * 1024
-        if len(image_data) > max_size_bytes:
-            size_mb = len(image_data) / (1024 * 1024)
-            return False, f"Image size {size_mb:.2f}MB exceeds 5MB limit"
-        
-        # Validate it's a valid image
-        try:
-            img = Image.open(io.BytesIO(image_data))
-            img.verify()
-            
-            # Check format
-            valid_formats = ['JPEG', 'PNG', 'WEBP']
-            if img.format not in valid_formats:
-                return False, f"Invalid image format. Allowed: {', '.join(valid_formats)}"
-            
-            return True, None
-        
-        except Exception as e:
-            return False, f"Invalid image data: {str(e)}"
+        image_data = decode_base64(base64_string)
+        is_valid, error_message, _img = validate_and_open(image_data)
+        return is_valid, error_message
     
-    except base64.binascii.Error:
+    except ValueError:
         return False, "Invalid base64 encoding"
     
     except Exception as e:
@@ -75,49 +187,36 @@ def validate_base64_image(base64_string: str) -> Tuple[bool, Optional[str]]:
         return False, f"Image validation failed: {str(e)}"
 
 
-def base64_to_image_file(
-    base64_string: str,
+def image_to_uploaded_file(
+    img: Image.Image,
     filename: str = 'complaint.jpg'
 ) -> Optional[InMemoryUploadedFile]:
     """
-    Convert base64 string to Django InMemoryUploadedFile.
+    Convert an opened Pillow image to Django InMemoryUploadedFile.
     
-    This allows saving base64 images to Django ImageField.
+    This allows saving images to Django ImageField.
     
     Args:
-        base64_string: Base64-encoded image
+        img: Image returned by validate_and_open
         filename: Filename to use for the uploaded file
     
     Returns:
         InMemoryUploadedFile instance or None if conversion fails
     
     Example:
-        >>> image_file = base64_to_image_file(base64_data, 'photo.jpg')
-        >>> complaint.image = image_file
+        >>> is_valid, error, img = validate_and_open(image_data)
+        >>> complaint.image = image_to_uploaded_file(img, 'photo.jpg')
         >>> complaint.save()
     """
     try:
-        # Remove data URI prefix if present
-        if ',' in base64_string:
-            base64_string = base64_string.split(',')[1]
-        
-        # Decode base64
-        image_data = base64.b64decode(base64_string)
-        
-        # Open image with Pillow
-        img = Image.open(io.BytesIO(image_data))
-        
-        # Determine format and extension
+        # Determine format, content type and extension from Pillow's
+        # registered MIME table
         img_format = img.format if img.format else 'JPEG'
-        extension_map = {
-            'JPEG': 'jpg',
-            'PNG': 'png',
-            'WEBP': 'webp'
-        }
+        content_type = Image.MIME.get(img_format, 'image/jpeg')
+        extension = content_type.rpartition('/')[2].replace('jpeg', 'jpg')
         
         # Ensure filename has correct extension
         base_name = filename.rsplit('.', 1)[0]
-        extension = extension_map.get(img_format, 'jpg')
         filename = f"{base_name}.{extension}"
         
         # Convert image to BytesIO buffer
@@ -125,15 +224,19 @@ def base64_to_image_file(
         
         # Save image to buffer
         if img_format == 'JPEG':
-            # Convert RGBA to RGB for JPEG
+            # Flatten transparency onto white for JPEG (composites against
+            # the alpha band directly instead of splitting every band out)
             if img.mode in ('RGBA', 'LA', 'P'):
-                background = Image.new('RGB', img.size, (255, 255, 255))
-                background.paste(img, mask=img.split()[-1] if img.mode == 'RGBA' else None)
-                img = background
+                if img.mode != 'RGBA':
+                    img = img.convert('RGBA')
+                background = Image.new('RGBA', img.size, (255, 255, 255, 255))
+                img = Image.alpha_composite(background, img).convert('RGB')
             img.save(buffer, format='JPEG', quality=85, optimize=True)
         else:
             img.save(buffer, format=img_format, optimize=True)
         
+        # Write position after saving is the encoded size
+        size = buffer.tell()
         buffer.seek(0)
         
         # Create InMemoryUploadedFile
@@ -141,18 +244,49 @@ def base64_to_image_file(
             buffer,
             'ImageField',
             filename,
-            f'image/{extension}',
-            buffer.getbuffer().nbytes,
+            content_type,
+            size,
             None
         )
         
-        logger.info(f"Converted base64 to image file: {filename}")
+        logger.info(f"Converted image to file: {filename}")
         
         return image_file
     
+    except Exception as e:
+        logger.error(f"Failed to convert image to file: {str(e)}")
+        return None
+
+
+def base64_to_image_file(
+    base64_string: str,
+    filename: str = 'complaint.jpg'
+) -> Optional[InMemoryUploadedFile]:
+    """
+    Convert base64 string to Django InMemoryUploadedFile.
+    
+    This allows saving base64 images to Django ImageField.
+    
+    Args:
+        base64_string: Base64-encoded image
+        filename: Filename to use for the uploaded file
+    
+    Returns:
+        InMemoryUploadedFile instance or None if conversion fails
+    
+    Example:
+        >>> image_file = base64_to_image_file(base64_data, 'photo.jpg')
+        >>> complaint.image = image_file
+        >>> complaint.save()
+    """
+    try:
+        img = Image.open(io.BytesIO(decode_base64(base64_string)))
+    
     except Exception as e:
         logger.error(f"Failed to convert base64 to image file: {str(e)}")
         return None
+    
+    return image_to_uploaded_file(img, filename)
 
 
 def optimize_image(image_path: str, max_width: int = 1920) -> None:
@@ -174,6 +308,12 @@ def optimize_image(image_path: str, max_width: int = 1920) -> None:
         
         # Resize if larger than max_width
         if img.width > max_width:
+            if img.format == 'JPEG':
+                # Let libjpeg decode at the smallest 1/2, 1/4 or 1/8 scale
+                # that still covers the target, so LANCZOS only resamples
+                # a small buffer
+                img.draft('RGB', (max_width, img.height * max_width // img.width))
+            
             aspect_ratio = img.height / img.width
             new_height = int(max_width * aspect_ratio)
             img = img.resize((max_width, new_height), Image.Resampling.LANCZOS)
@@ -185,3 +325,42 @@ def optimize_image(image_path: str, max_width: int = 1920) -> None:
     
     except Exception as e:
         logger.error(f"Failed to optimize image {image_path}: {str(e)}")
+
+
+def downscale_for_analysis(image_path: str, max_side: int = 1280) -> Optional[BinaryIO]:
+    """
+    Downscale an image to the AI model's input size for upload.
+    
+    The detection model resizes every image to its input size anyway,
+    so sending full-resolution camera photos only costs bandwidth and
+    preprocessing time. The original file on disk is left untouched.
+    
+    Args:
+        image_path: Path to image file
+        max_side: Maximum width/height in pixels (maintains aspect ratio)
+    
+    Returns:
+        JPEG file object positioned at the start, or None if the image
+        already fits (or cannot be read) and should be sent as is
+    """
+    try:
+        with Image.open(image_path) as img:
+            if max(img.size) <= max_side:
+                return None
+            
+            if img.format == 'JPEG':
+                # Decode at a reduced scale, as in optimize_image()
+                img.draft('RGB', (max_side, max_side))
+            
+            img.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+            if img.mode != 'RGB':
+                img = img.convert('RGB')
+            
+            buffer = io.BytesIO()
+            img.save(buffer, format='JPEG', quality=85, optimize=True)
+            buffer.seek(0)
+            return buffer
+    
+    except Exception as e:
+        logger.warning(f"Failed to downscale image {image_path}, sending original: {str(e)}")
+        return None
@@ -6,14 +6,20 @@ Format: CMP-YYYYMMDD-NNN (e.g., CMP-20260110-001)
 """
 
 import logging
+import re
 from datetime import date
-from django.db import transaction
-from user_portal.models import Ticket
+from typing import List
+from django.db import connection
+from user_portal.models import DailyTicketCounter
 
 
 logger = logging.getLogger(__name__)
 
 
+# CMP-YYYYMMDD-NNN
+TICKET_NUMBER_RE = re.compile(r'(CMP)-(\d{8})-(\d{3})')
+
+
 def generate_ticket_number() -> str:
     """
     Generate unique ticket number with daily reset counter.
@@ -34,35 +40,53 @@ def generate_ticket_number() -> str:
         Next day first: CMP-20260111-001
     
     Note:
-        Uses database transaction to ensure thread-safe counter increment.
-        Prevents duplicate numbers even under concurrent ticket creation.
+        Uses a single atomic upsert on DailyTicketCounter, which prevents
+        duplicate numbers even under concurrent ticket creation.
+    """
+    return generate_ticket_numbers(1)[0]
+
+
+def generate_ticket_numbers(count: int) -> List[str]:
+    """
+    Reserve a block of consecutive ticket numbers for today.
+    
+    One upsert on today's DailyTicketCounter row serves the whole block,
+    so a complaint that yields several issues costs a single query.
+    
+    Args:
+        count: Number of ticket numbers to generate
+    
+    Returns:
+        List of unique ticket number strings in ascending order
+    
+    Example:
+        >>> generate_ticket_numbers(3)
+        ['CMP-20260110-004', 'CMP-20260110-005', 'CMP-20260110-006']
     """
     today = date.today()
-    date_str = today.strftime('%Y%m%d')
-    prefix = f"CMP-{date_str}-"
-    
-    # Find highest ticket number for today
-    with transaction.atomic():
-        # Lock table to prevent race conditions
-        today_tickets = Ticket.objects.filter(
-            ticket_number__startswith=prefix
-        ).order_by('-ticket_number').first()
-        
-        if today_tickets:
-            # Extract counter from last ticket number
-            last_number = today_tickets.ticket_number
-            last_counter = int(last_number.split('-')[-1])
-            new_counter = last_counter + 1
-        else:
-            # First ticket of the day
-            new_counter = 1
-        
-        # Format counter as zero-padded 3-digit number
-        ticket_number = f"{prefix}{new_counter:03d}"
-        
-        logger.info(f"Generated ticket number: {ticket_number}")
-        
-        return ticket_number
+    prefix = f"CMP-{today.strftime('%Y%m%d')}-"
+    
+    # Atomically reserve the block on today's counter row (created on
+    # first use) and read back the last counter in the block
+    table = DailyTicketCounter._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table} (date, counter) VALUES (%s, %s) "
+            f"ON CONFLICT (date) DO UPDATE SET counter = {table}.counter + excluded.counter "
+            f"RETURNING counter",
+            [today.isoformat(), count]
+        )
+        last_counter = cursor.fetchone()[0]
+    
+    # Format counters as zero-padded 3-digit numbers
+    ticket_numbers = [
+        f"{prefix}{counter:03d}"
+        for counter in range(last_counter - count + 1, last_counter + 1)
+    ]
+    
+    logger.info(f"Generated ticket numbers: {', '.join(ticket_numbers)}")
+    
+    return ticket_numbers
 
 
 def parse_ticket_number(ticket_number: str) -> dict:
@@ -86,28 +110,14 @@ def parse_ticket_number(ticket_number: str) -> dict:
         >>> parse_ticket_number('CMP-20260110-001')
         {'prefix': 'CMP', 'date': '20260110', 'counter': '001', 'is_valid': True}
     """
-    try:
-        parts = ticket_number.split('-')
-        
-        if len(parts) != 3:
-            return {'is_valid': False}
-        
-        prefix, date_str, counter = parts
-        
-        # Validate format
-        if (prefix == 'CMP' and 
-            len(date_str) == 8 and date_str.isdigit() and
-            len(counter) == 3 and counter.isdigit()):
-            
-            return {
-                'prefix': prefix,
-                'date': date_str,
-                'counter': counter,
-                'is_valid': True
-            }
-        
-        return {'is_valid': False}
+    match = TICKET_NUMBER_RE.fullmatch(ticket_number)
     
-    except Exception as e:
-        logger.error(f"Error parsing ticket number '{ticket_number}': {str(e)}")
+    if not match:
         return {'is_valid': False}
+    
+    return {
+        'prefix': match[1],
+        'date': match[2],
+        'counter': match[3],
+        'is_valid': True
+    }
@@ -16,7 +16,10 @@ import logging
 from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.response import Response
+from django.conf import settings
+from django.core.cache import cache
 from django.db import transaction
+from django.utils import timezone
 from django.shortcuts import render, get_object_or_404
 from django.views.generic import TemplateView
 from django.views.decorators.csrf import csrf_exempt
@@ -24,7 +27,7 @@ from django.utils.decorators import method_decorator
 
 from contractor_portal.fastapi_client import FastAPIClient, FastAPIError
 
-from user_portal.models import CivicComplaint, Ticket
+from user_portal.models import CivicComplaint, Ticket, track_ticket_cache_key
 from user_portal.serializers import (
     PhotoCaptureSerializer,
     SubmitComplaintSerializer,
@@ -32,12 +35,14 @@ from user_portal.serializers import (
     TicketRatingSerializer,
     CivicComplaintSerializer
 )
-from user_portal.utils.geocoding import geocode_coordinates
+from user_portal.utils.background import run_in_background
+from user_portal.utils.geocoding import submit_geocode
 from user_portal.utils.image_validator import (
-    validate_base64_image,
-    base64_to_image_file
+    decode_base64_to_file,
+    validate_and_open,
+    image_to_uploaded_file
 )
-from user_portal.utils.ticket_generator import generate_ticket_number
+from user_portal.utils.ticket_generator import generate_ticket_numbers
 
 
 logger = logging.getLogger(__name__)
@@ -108,6 +113,20 @@ class CapturePhotoView(APIView):
     
     def post(self, request):
         """Handle photo capture request."""
+        # DRF parses JSON straight from the request stream, so Django's
+        # DATA_UPLOAD_MAX_MEMORY_SIZE does not apply here; reject oversized
+        # bodies from Content-Length before request.data reads them
+        try:
+            content_length = int(request.META.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            content_length = 0
+        
+        if content_length > settings.DATA_UPLOAD_MAX_MEMORY_SIZE:
+            return Response({
+                'success': False,
+                'error': 'Request too large. Maximum image size is 5MB.'
+            }, status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+        
         serializer = PhotoCaptureSerializer(data=request.data)
         
         if not serializer.is_valid():
@@ -118,19 +137,38 @@ class CapturePhotoView(APIView):
         
         # Extract validated data
         image_base64 = serializer.validated_data['image_base64']
-        latitude = float(serializer.validated_data['latitude'])
-        longitude = float(serializer.validated_data['longitude'])
+        latitude = serializer.validated_data['latitude']
+        longitude = serializer.validated_data['longitude']
         
-        # Validate image
-        is_valid, error_message = validate_base64_image(image_base64)
-        if not is_valid:
+        # Decode image in chunks to a temporary file, then validate and
+        # convert it once; the opened image is reused for conversion
+        try:
+            image_stream = decode_base64_to_file(image_base64)
+        except ValueError:
+            # Bad base64 raises binascii.Error, a ValueError subclass;
+            # non-ASCII input raises a plain ValueError
             return Response({
                 'success': False,
-                'error': error_message
+                'error': 'Invalid base64 encoding'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        # Reverse geocode coordinates
-        location_data = geocode_coordinates(latitude, longitude)
+        with image_stream:
+            is_valid, error_message, img = validate_and_open(image_stream)
+            if not is_valid:
+                return Response({
+                    'success': False,
+                    'error': error_message
+                }, status=status.HTTP_400_BAD_REQUEST)
+            
+            # Reverse geocode on a worker thread while the image is converted
+            # here. Started only once the image is valid, so junk uploads do
+            # not spend the Nominatim rate limit or tie up a pool worker.
+            location_future = submit_geocode(latitude, longitude)
+            
+            # Convert image to file for storage
+            image_file = image_to_uploaded_file(img, 'complaint.jpg')
+        
+        location_data = location_future.result()
         
         if not location_data:
             return Response({
@@ -138,9 +176,6 @@ class CapturePhotoView(APIView):
                 'error': 'Failed to fetch address from coordinates. Please ensure location is in Ahmedabad.'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        # Convert base64 to image file
-        image_file = base64_to_image_file(image_base64, 'complaint.jpg')
-        
         if not image_file:
             return Response({
                 'success': False,
@@ -160,8 +195,8 @@ class CapturePhotoView(APIView):
             )
             
             logger.info(
-                f"Photo captured: session_id={complaint.session_id}, "
-                f"location={location_data['area']}"
+                "Photo captured: session_id=%s, location=%s",
+                complaint.session_id, location_data['area']
             )
             
             return Response({
@@ -177,7 +212,7 @@ class CapturePhotoView(APIView):
             }, status=status.HTTP_201_CREATED)
         
         except Exception as e:
-            logger.error(f"Failed to save complaint: {str(e)}")
+            logger.error("Failed to save complaint: %s", e)
             return Response({
                 'success': False,
                 'error': 'Failed to save complaint. Please try again.'
@@ -230,17 +265,18 @@ class SubmitComplaintView(APIView):
                 'errors': serializer.errors
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        # Fetch complaint
+        # Fetch complaint (only the columns sent to the AI service)
+        drafts = CivicComplaint.objects.filter(is_submit=False).only(
+            'id', 'image', 'street', 'area', 'postal_code', 'latitude', 'longitude'
+        )
         try:
             if serializer.validated_data.get('session_id'):
-                complaint = CivicComplaint.objects.get(
-                    session_id=serializer.validated_data['session_id'],
-                    is_submit=False
+                complaint = drafts.get(
+                    session_id=serializer.validated_data['session_id']
                 )
             else:
-                complaint = CivicComplaint.objects.get(
-                    id=serializer.validated_data['complaint_id'],
-                    is_submit=False
+                complaint = drafts.get(
+                    id=serializer.validated_data['complaint_id']
                 )
         except CivicComplaint.DoesNotExist:
             return Response({
@@ -248,18 +284,22 @@ class SubmitComplaintView(APIView):
                 'error': 'Complaint not found or already submitted'
             }, status=status.HTTP_404_NOT_FOUND)
         
-        # Mark as submitted
-        complaint.is_submit = True
-        complaint.save()
-        
         # Call AI validation using FastAPI
         ai_response = self._call_ai_validation(complaint)
         
         if not ai_response['is_valid']:
-            # Delete invalid complaint
-            complaint.delete()
+            # Delete invalid complaint, unless a concurrent submit of the
+            # same draft has already turned it into tickets. The queryset
+            # delete skips CivicComplaint.delete(), so remove the photo here.
+            deleted, _ = CivicComplaint.objects.filter(
+                pk=complaint.pk,
+                is_submit=False
+            ).delete()
+            
+            if deleted and complaint.image:
+                run_in_background(complaint.image.storage.delete, complaint.image.name)
             
-            logger.info(f"Invalid complaint deleted: {complaint.id}")
+            logger.info("Invalid complaint deleted: %s", complaint.id)
             
             return Response({
                 'success': False,
@@ -269,46 +309,63 @@ class SubmitComplaintView(APIView):
         
         # Create tickets from AI response
         try:
+            issues = ai_response['data']
+            
+            # Reserve numbers before the transaction: the counter upsert
+            # commits on its own, so its row lock is not held while the
+            # complaint and tickets are written (a failure leaves a gap)
+            ticket_numbers = generate_ticket_numbers(len(issues))
+            
+            # Convert list fields to comma-separated strings
+            tickets = [
+                Ticket(
+                    ticket_number=ticket_number,
+                    civic_complaint=complaint,
+                    severity=issue_data['severity'],
+                    category=issue_data['category'],
+                    department=issue_data['department'],
+                    suggested_tools=', '.join(issue_data.get('suggested_tools') or []),
+                    safety_equipment=', '.join(issue_data.get('safety_equipment') or []),
+                    status='SUBMITTED'
+                )
+                for ticket_number, issue_data in zip(ticket_numbers, issues)
+            ]
+            
             with transaction.atomic():
-                complaint.is_valid = True
-                complaint.save()
-                
-                tickets_created = []
-                
-                for issue_data in ai_response['data']:
-                    ticket_number = generate_ticket_number()
-                    
-                    # Convert list fields to comma-separated strings
-                    suggested_tools = ', '.join(issue_data.get('suggested_tools', [])) if issue_data.get('suggested_tools') else ''
-                    safety_equipment = ', '.join(issue_data.get('safety_equipment', [])) if issue_data.get('safety_equipment') else ''
-                    
-                    ticket = Ticket.objects.create(
-                        ticket_number=ticket_number,
-                        civic_complaint=complaint,
-                        severity=issue_data['severity'],
-                        category=issue_data['category'],
-                        department=issue_data['department'],
-                        suggested_tools=suggested_tools,
-                        safety_equipment=safety_equipment,
-                        status='SUBMITTED'
-                    )
-                    
-                    tickets_created.append(ticket_number)
-                    
-                    logger.info(
-                        f"Ticket created: {ticket_number} - "
-                        f"{issue_data['category']} ({issue_data['department']})"
-                    )
+                # Submit and validate the draft in one UPDATE; the is_submit
+                # guard stops a concurrent submit of the same draft from
+                # creating its tickets twice
+                claimed = CivicComplaint.objects.filter(
+                    pk=complaint.pk,
+                    is_submit=False
+                ).update(is_submit=True, is_valid=True, updated_at=timezone.now())
                 
+                if claimed:
+                    # Insert all tickets in one statement
+                    Ticket.objects.bulk_create(tickets)
+            
+            if not claimed:
                 return Response({
-                    'success': True,
-                    'tickets': tickets_created,
-                    'message': f"{len(tickets_created)} ticket(s) created successfully",
-                    'details': ai_response['data']
-                }, status=status.HTTP_201_CREATED)
+                    'success': False,
+                    'error': 'Complaint not found or already submitted'
+                }, status=status.HTTP_404_NOT_FOUND)
+            
+            # One record for the whole complaint rather than one per ticket
+            logger.info(
+                "Tickets created for complaint %s: %s",
+                complaint.id,
+                [(ticket.ticket_number, ticket.category, ticket.department) for ticket in tickets]
+            )
+            
+            return Response({
+                'success': True,
+                'tickets': ticket_numbers,
+                'message': f"{len(ticket_numbers)} ticket(s) created successfully",
+                'details': issues
+            }, status=status.HTTP_201_CREATED)
         
         except Exception as e:
-            logger.error(f"Failed to create tickets: {str(e)}")
+            logger.error("Failed to create tickets: %s", e)
             return Response({
                 'success': False,
                 'error': 'Failed to create tickets. Please contact support.'
@@ -371,13 +428,16 @@ class SubmitComplaintView(APIView):
             error_message = result.get('error')
             
             if is_valid:
-                logger.info(f"AI validation successful for complaint {complaint.id}: {len(data_list)} issue(s) detected")
+                logger.info(
+                    "AI validation successful for complaint %s: %d issue(s) detected",
+                    complaint.id, len(data_list)
+                )
                 return {
                     'is_valid': True,
                     'data': data_list
                 }
             else:
-                logger.warning(f"AI validation failed for complaint {complaint.id}: {error_message}")
+                logger.warning("AI validation failed for complaint %s: %s", complaint.id, error_message)
                 return {
                     'is_valid': False,
                     'data': [],
@@ -386,13 +446,13 @@ class SubmitComplaintView(APIView):
         
         except FastAPIError as e:
             # Log FastAPI errors but fall back to mock validation
-            logger.error(f"FastAPI error for complaint {complaint.id}: {str(e)}")
+            logger.error("FastAPI error for complaint %s: %s", complaint.id, e)
             logger.info("Falling back to mock AI validation due to FastAPI error")
             return {"error": str(e)}
         
         except Exception as e:
             # Log unexpected errors but fall back to mock validation
-            logger.error(f"Unexpected error calling AI service for complaint {complaint.id}: {str(e)}")
+            logger.error("Unexpected error calling AI service for complaint %s: %s", complaint.id, e)
             logger.info("Falling back to mock AI validation due to unexpected error")
             return {"error": str(e)}
 
@@ -447,25 +507,36 @@ class TrackTicketView(APIView):
                 'error': 'ticket_number parameter is required'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        # Exact match search
-        try:
-            ticket = Ticket.objects.select_related(
-                'civic_complaint',
-                'contractor',
-                'ward'
-            ).get(ticket_number=ticket_number)
-        except Ticket.DoesNotExist:
-            return Response({
-                'success': False,
-                'error': f'Ticket {ticket_number} not found'
-            }, status=status.HTTP_404_NOT_FOUND)
+        # Tickets are polled repeatedly; serve recent payloads from cache
+        # (Ticket.save() drops the entry when the ticket changes)
+        cache_key = track_ticket_cache_key(ticket_number)
+        ticket_data = cache.get(cache_key)
+        
+        if ticket_data is None:
+            # Exact match search
+            try:
+                ticket = TicketDetailSerializer.setup_eager_loading(
+                    Ticket.objects.all()
+                ).get(ticket_number=ticket_number)
+            except Ticket.DoesNotExist:
+                return Response({
+                    'success': False,
+                    'error': f'Ticket {ticket_number} not found'
+                }, status=status.HTTP_404_NOT_FOUND)
+            
+            # Serialize without the request so the cached image URL stays
+            # relative; each response makes it absolute for its own host
+            serializer = TicketDetailSerializer(ticket)
+            ticket_data = serializer.data
+            cache.set(cache_key, ticket_data, settings.TRACK_TICKET_CACHE_TTL)
         
-        # Serialize ticket data
-        serializer = TicketDetailSerializer(ticket, context={'request': request})
+        ticket_data = dict(ticket_data)
+        if ticket_data['image_url']:
+            ticket_data['image_url'] = request.build_absolute_uri(ticket_data['image_url'])
         
         return Response({
             'success': True,
-            'ticket': serializer.data
+            'ticket': ticket_data
         }, status=status.HTTP_200_OK)
 
 
@@ -485,10 +556,12 @@ class RateTicketView(APIView):
     Response:
         {
             "success": true,
-            "message": "Rating submitted successfully",
-            "contractor_rating": 4.25
+            "message": "Rating submitted successfully"
         }
     
+    The contractor's average rating is recalculated in the background
+    after the rating commits, so it is not part of the response.
+    
     Validation:
         - Ticket must exist
         - Ticket status must be RESOLVED
@@ -540,16 +613,18 @@ class RateTicketView(APIView):
         
         # Save rating
         ticket.user_rating = rating
-        ticket.save()  # This will trigger contractor rating update
+        # Write only the rating columns; Ticket.save() queues the
+        # contractor rating update
+        ticket.save(update_fields=['user_rating', 'updated_at'])
         
         logger.info(
-            f"Ticket rated: {ticket_number} - {rating} stars "
-            f"(Contractor: {ticket.contractor.contractor_name if ticket.contractor else 'N/A'})"
+            "Ticket rated: %s - %s stars (Contractor: %s)",
+            ticket_number, rating,
+            ticket.contractor.contractor_name if ticket.contractor else 'N/A'
         )
         
         return Response({
             'success': True,
-            'message': 'Rating submitted successfully. Thank you for your feedback!',
-            'contractor_rating': float(ticket.contractor.ratings) if ticket.contractor else None
+            'message': 'Rating submitted successfully. Thank you for your feedback!'
         }, status=status.HTTP_200_OK)
 